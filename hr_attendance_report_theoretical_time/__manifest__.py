@@ -2,7 +2,7 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 {
     "name": "Theoretical vs Attended Time Analysis",
-    "version": "12.0.1.0.1",
+    "version": "12.0.1.2.0",
     "category": "Human Resources",
     "website": "https://github.com/OCA/hr",
     "author": "Tecnativa, "
@@ -16,9 +16,11 @@
     "data": [
         "security/ir.model.access.csv",
         "security/hr_attendance_report_theoretical_time_security.xml",
+        "data/ir_cron.xml",
         "views/hr_attendance_views.xml",
         "views/hr_leave_type_views.xml",
         "views/hr_employee_views.xml",
+        "views/hr_attendance_theoretical_queue_views.xml",
         "reports/hr_attendance_theoretical_time_report_views.xml",
     ],
 }
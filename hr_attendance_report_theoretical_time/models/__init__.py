@@ -5,3 +5,8 @@ from . import hr_employee
 from . import hr_holidays_public
 from . import hr_leave
 from . import hr_leave_type
+from . import res_partner
+from . import resource_calendar
+from . import resource_calendar_attendance
+from . import resource_calendar_leaves
+from . import hr_attendance_theoretical_queue
@@ -1,6 +1,8 @@
 # Copyright 2017-2019 Tecnativa - Pedro M. Baeza
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
+from collections import defaultdict
+
 from odoo import api, fields, models
 
 
@@ -15,8 +17,78 @@ class HrAttendance(models.Model):
 
     @api.depends('check_in', 'employee_id')
     def _compute_theoretical_hours(self):
+        """Compute the theoretical hours once per check-in date for all the
+        employees having attendances that day, instead of record by record.
+        """
         obj = self.env['hr.attendance.theoretical.time.report']
+        employees_by_date = defaultdict(set)
+        for record in self.filtered(lambda x: x.check_in and x.employee_id):
+            employees_by_date[record.check_in.date()].add(
+                record.employee_id.id,
+            )
+        hours = {}
+        for date, employee_ids in employees_by_date.items():
+            hours.update(obj._theoretical_hours_batch(
+                self.env['hr.employee'].browse(sorted(employee_ids)),
+                date, date,
+            ))
         for record in self:
-            record.theoretical_hours = obj._theoretical_hours(
-                record.employee_id, record.check_in,
+            record.theoretical_hours = hours.get(
+                (record.employee_id.id, record.check_in and
+                 record.check_in.date()), 0,
             )
+
+    def _recompute_theoretical_hours(self):
+        """Recompute the stored theoretical hours of these attendances
+        through the ORM, which computes them in batch and writes at once
+        all the records sharing the same value. The cached values are
+        invalidated first, as they would be taken as already computed.
+        """
+        self.invalidate_cache(['theoretical_hours'], self.ids)
+        self.env.add_todo(self._fields['theoretical_hours'], self)
+        self.recompute()
+        self._refresh_theoretical_time_report()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._refresh_theoretical_time_report()
+        return records
+
+    @api.multi
+    def write(self, vals):
+        """Refresh the materialized report for both previous and new employee
+        and date of the attendances."""
+        if not {'employee_id', 'check_in', 'check_out'} & set(vals):
+            return super().write(vals)
+        employees = self.mapped('employee_id')
+        dates = self.mapped('check_in')
+        res = super().write(vals)
+        self._refresh_theoretical_time_report(employees, dates)
+        return res
+
+    @api.multi
+    def unlink(self):
+        employees = self.mapped('employee_id')
+        dates = self.mapped('check_in')
+        res = super().unlink()
+        self.browse()._refresh_theoretical_time_report(employees, dates)
+        return res
+
+    def _refresh_theoretical_time_report(self, employees=None, dates=None):
+        """Refresh the materialized report rows for the employees and days
+        of these attendances, plus the given extra ones.
+
+        :param: employees: Additional employees recordset to refresh.
+        :param: dates: Additional check-in datetimes to refresh.
+        """
+        obj = self.env['hr.attendance.theoretical.time.report']
+        if not obj._is_materialized():
+            return
+        employees = self.mapped('employee_id') | (
+            employees or self.env['hr.employee']
+        )
+        days = {x.date() for x in self.mapped('check_in') + (dates or [])}
+        if not employees or not days:
+            return
+        obj._refresh_materialized(employees.ids, min(days), max(days))
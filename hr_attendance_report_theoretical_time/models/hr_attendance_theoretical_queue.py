@@ -0,0 +1,137 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from odoo import api, fields, models, tools
+from odoo.osv import expression
+
+
+class HrAttendanceTheoreticalQueue(models.Model):
+    _name = 'hr.attendance.theoretical.queue'
+    _description = 'Pending recomputation of attendances theoretical hours'
+    _order = 'id'
+    _rec_name = 'date_from'
+
+    employee_id = fields.Many2one(
+        comodel_name='hr.employee',
+        string="Employee",
+        ondelete='cascade',
+        readonly=True,
+        help="If not set, attendances of all the employees are recomputed.",
+    )
+    date_from = fields.Date(
+        string="From",
+        required=True,
+        readonly=True,
+    )
+    date_to = fields.Date(
+        string="To",
+        required=True,
+        readonly=True,
+    )
+
+    @api.model
+    def _is_deferred(self):
+        """Tell if the recomputations are left to the scheduled action."""
+        return tools.str2bool(
+            self.env['ir.config_parameter'].sudo().get_param(
+                'hr_attendance_report_theoretical_time.deferred_recompute',
+                'False',
+            ),
+            False,
+        )
+
+    @api.model
+    def _recompute_theoretical_hours(self, spans, deferred=None):
+        """Recompute the theoretical hours of the attendances inside the
+        given spans, or enqueue them if the recomputation is deferred.
+
+        :param: spans: Iterable of tuples (employee ID, date from, date to).
+          Employee ID can be False for recomputing all employees.
+        :param: deferred: Force enqueuing the spans if True. If None, it
+          depends on the system parameter.
+        """
+        spans = list(spans)
+        if not spans:
+            return
+        if deferred or (deferred is None and self._is_deferred()):
+            self.sudo().create([{
+                'employee_id': employee_id,
+                'date_from': date_from,
+                'date_to': date_to,
+            } for employee_id, date_from, date_to in spans])
+        else:
+            self._process_spans(spans)
+
+    @api.model
+    def _coalesce_spans(self, spans):
+        """Merge the overlapping or contiguous spans of the same employee.
+
+        :param: spans: Iterable of tuples (employee ID, date from, date to).
+        :return: List of merged tuples (employee ID, date from, date to).
+        """
+        spans_by_employee = defaultdict(list)
+        for employee_id, date_from, date_to in spans:
+            spans_by_employee[employee_id].append((
+                fields.Date.to_date(date_from), fields.Date.to_date(date_to),
+            ))
+        res = []
+        for employee_id, dates in spans_by_employee.items():
+            dates.sort()
+            current_from, current_to = dates[0]
+            for date_from, date_to in dates[1:]:
+                if date_from <= current_to + timedelta(days=1):
+                    current_to = max(current_to, date_to)
+                    continue
+                res.append((employee_id, current_from, current_to))
+                current_from, current_to = date_from, date_to
+            res.append((employee_id, current_from, current_to))
+        return res
+
+    @api.model
+    def _process_spans(self, spans):
+        """Recompute at once the theoretical hours of the attendances inside
+        the given spans.
+
+        :param: spans: Iterable of tuples (employee ID, date from, date to).
+        """
+        domains = []
+        spans = self._coalesce_spans(spans)
+        for employee_id, date_from, date_to in spans:
+            domain = [
+                ('check_in', '>=', datetime.combine(date_from, time.min)),
+                ('check_in', '<=', datetime.combine(date_to, time.max)),
+            ]
+            if employee_id:
+                domain.append(('employee_id', '=', employee_id))
+            domains.append(domain)
+        if domains:
+            self.env['hr.attendance'].sudo().search(
+                expression.OR(domains),
+            )._recompute_theoretical_hours()
+        # Non worked days of the materialized report store their hours too
+        obj = self.env['hr.attendance.theoretical.time.report']
+        if obj._is_materialized():
+            for employee_id, date_from, date_to in spans:
+                obj._refresh_materialized(
+                    employee_id and [employee_id] or None, date_from, date_to,
+                )
+
+    @api.multi
+    def action_process(self):
+        """Process now the selected pending spans."""
+        self._process_spans([
+            (x.employee_id.id, x.date_from, x.date_to) for x in self
+        ])
+        self.sudo().unlink()
+
+    @api.model
+    def _cron_process_queue(self, limit=5000):
+        """Process pending spans in coalesced batches.
+
+        :param: limit: Maximum number of spans processed in each execution.
+        """
+        records = self.search([], limit=limit)
+        if records:
+            records.action_process()
@@ -1,7 +1,7 @@
 # Copyright 2018 Tecnativa - Pedro M. Baeza
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import fields, models
+from odoo import api, fields, models
 
 
 class HrEmployee(models.Model):
@@ -13,3 +13,29 @@ class HrEmployee(models.Model):
              "not filled, employee creation date or the calendar start date "
              "will be used (the greatest of both).",
     )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        obj = self.env['hr.attendance.theoretical.time.report']
+        obj._refresh_materialized(records.ids)
+        return records
+
+    @api.multi
+    def write(self, vals):
+        res = super().write(vals)
+        if set(vals) & {
+            'theoretical_hours_start_date', 'resource_calendar_id',
+            'address_id', 'tz',
+        }:
+            obj = self.env['hr.attendance.theoretical.time.report']
+            obj._refresh_materialized(self.ids)
+        return res
+
+    @api.multi
+    def unlink(self):
+        ids = self.ids
+        res = super().unlink()
+        obj = self.env['hr.attendance.theoretical.time.report']
+        obj._refresh_materialized(ids)
+        return res
@@ -2,7 +2,19 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
 from odoo import api, fields, models
-from datetime import datetime, time
+
+
+class HrHolidaysPublic(models.Model):
+    _inherit = 'hr.holidays.public'
+
+    @api.multi
+    def write(self, vals):
+        res = super().write(vals)
+        if 'country_id' in vals:
+            self.env[
+                'hr.holidays.public.line'
+            ]._check_theoretical_hours_dates(self.mapped('line_ids.date'))
+        return res
 
 
 class HrHolidaysPublicLine(models.Model):
@@ -15,35 +27,49 @@ class HrHolidaysPublicLine(models.Model):
 
         :param: date: Date for recomputing attendances.
         """
-        if not date:
-            return
-        if isinstance(date, str):
-            date = fields.Date.from_string(date)
-        from_datetime = datetime.combine(date, time(0, 0, 0, 0))
-        to_datetime = datetime.combine(date, time(23, 59, 59, 99999))
-        records = self.env['hr.attendance'].search([
-            ('check_in', '>=', fields.Datetime.to_string(from_datetime)),
-            ('check_in', '<=', fields.Datetime.to_string(to_datetime)),
-        ])
-        records._compute_theoretical_hours()
+        self._check_theoretical_hours_dates([date])
+
+    @api.model
+    def _check_theoretical_hours_dates(self, dates):
+        """Recomputes at once all the theoretical hours that corresponds to
+        several dates of public holidays.
+
+        :param: dates: Iterable of dates for recomputing attendances.
+        """
+        spans = []
+        for date in set(dates):
+            if not date:
+                continue
+            if isinstance(date, str):
+                date = fields.Date.from_string(date)
+            spans.append((False, date, date))
+        queue_obj = self.env['hr.attendance.theoretical.queue']
+        queue_obj._recompute_theoretical_hours(spans)
 
     @api.model_create_multi
     def create(self, vals_list):
         """Trigger recomputation for the date of the new lines."""
         records = super(HrHolidaysPublicLine, self).create(vals_list)
-        for record in records:
-            self._check_theoretical_hours(record.date)
+        self._check_theoretical_hours_dates(records.mapped('date'))
         return records
 
     def write(self, vals):
-        """If the date of a line is changed, we first recompute hours of the
-        previous date, and then the theoretical hours of the current date.
+        """If the date of a line is changed, we recompute at once hours of the
+        previous dates and the theoretical hours of the current date.
         """
         if 'date' in vals:
             dates = set(self.mapped('date'))
             dates.add(vals['date'])
         res = super(HrHolidaysPublicLine, self).write(vals)
         if 'date' in vals:
-            for date in dates:
-                self._check_theoretical_hours(date=date)
+            self._check_theoretical_hours_dates(dates)
+        elif {'state_ids', 'year_id'} & set(vals):
+            self._check_theoretical_hours_dates(self.mapped('date'))
+        return res
+
+    def unlink(self):
+        """Trigger recomputation for the date of the removed lines."""
+        dates = set(self.mapped('date'))
+        res = super(HrHolidaysPublicLine, self).unlink()
+        self._check_theoretical_hours_dates(dates)
         return res
@@ -27,17 +27,10 @@ class HrLeave(models.Model):
 
         :param: self: Leave recordset.
         """
-        to_recompute = self.env['hr.attendance']
-        for record in self.filtered(lambda x: x.date_from and x.date_to):
-            from_datetime = record.date_from.replace(
-                hour=0, minute=0, second=0, microsecond=0,
+        queue_obj = self.env['hr.attendance.theoretical.queue']
+        queue_obj._recompute_theoretical_hours(
+            (x.employee_id.id, x.date_from.date(), x.date_to.date())
+            for x in self.filtered(
+                lambda x: x.employee_id and x.date_from and x.date_to
             )
-            to_datetime = record.date_to.replace(
-                hour=23, minute=59, second=59, microsecond=99999,
-            )
-            to_recompute |= self.env['hr.attendance'].search([
-                ('employee_id', '=', record.employee_id.id),
-                ('check_in', '>=', from_datetime),
-                ('check_in', '<=', to_datetime),
-            ])
-        to_recompute._compute_theoretical_hours()
+        )
@@ -1,7 +1,7 @@
 # Copyright 2018-2019 Tecnativa - Pedro M. Baeza
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
-from odoo import fields, models
+from odoo import api, fields, models
 
 
 class HrLeaveType(models.Model):
@@ -12,3 +12,23 @@ class HrLeaveType(models.Model):
         help="If you check this mark, leaves in this category won't reduce "
              "the number of theoretical hours in the attendance report.",
     )
+
+    @api.multi
+    def write(self, vals):
+        res = super().write(vals)
+        if 'include_in_theoretical' in vals:
+            # Recomputing all the leaves of the types can take long, so it
+            # is always left to the scheduled action
+            leaves = self.env['hr.leave'].search([
+                ('holiday_status_id', 'in', self.ids),
+                ('state', '=', 'validate'),
+            ])
+            self.env[
+                'hr.attendance.theoretical.queue'
+            ]._recompute_theoretical_hours((
+                (x.employee_id.id, x.date_from.date(), x.date_to.date())
+                for x in leaves.filtered(
+                    lambda x: x.employee_id and x.date_from and x.date_to
+                )
+            ), deferred=True)
+        return res
@@ -0,0 +1,20 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, models
+
+
+class ResPartner(models.Model):
+    _inherit = 'res.partner'
+
+    @api.multi
+    def write(self, vals):
+        """Refresh the materialized report of the employees having these
+        partners as address, as their public holidays depend on them."""
+        res = super().write(vals)
+        obj = self.env['hr.attendance.theoretical.time.report']
+        if {'country_id', 'state_id'} & set(vals) and obj._is_materialized():
+            employees = self.env['hr.employee'].with_context(
+                active_test=False,
+            ).search([('address_id', 'in', self.ids)])
+            obj._refresh_materialized(employees.ids)
+        return res
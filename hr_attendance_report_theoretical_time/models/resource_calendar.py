@@ -0,0 +1,58 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, fields, models
+
+
+class ResourceCalendar(models.Model):
+    _inherit = 'resource.calendar'
+
+    theoretical_hours_version = fields.Integer(
+        readonly=True,
+        copy=False,
+        help="Technical field changed each time the working intervals "
+             "cached for computing the theoretical hours are outdated.",
+    )
+
+    @api.model_cr
+    def init(self):
+        super().init()
+        self.env.cr.execute(
+            "CREATE SEQUENCE IF NOT EXISTS %s_theoretical_hours_version_seq"
+            % self._table
+        )
+
+    def _clear_theoretical_hours_cache(self):
+        """Outdate the working intervals cached for computing the theoretical
+        hours of these working schedules only, by changing their version.
+        Versions are taken from a sequence, so they are never reused, not
+        even after a rollback.
+        """
+        ids = [x for x in self.ids if isinstance(x, int)]
+        if not ids:
+            return
+        self.env.cr.execute("""
+            UPDATE %s
+            SET theoretical_hours_version =
+                nextval('%s_theoretical_hours_version_seq')
+            WHERE id IN %%s
+            """ % (self._table, self._table), (tuple(ids), ))
+        self.invalidate_cache(['theoretical_hours_version'], ids)
+
+    def _refresh_theoretical_time_report(self):
+        """Refresh the materialized report rows of the employees using these
+        working schedules, as the generated days and their hours depend on
+        their lines."""
+        obj = self.env['hr.attendance.theoretical.time.report']
+        if not self or not obj._is_materialized():
+            return
+        employees = self.env['hr.employee'].with_context(
+            active_test=False,
+        ).search([('resource_calendar_id', 'in', self.ids)])
+        obj._refresh_materialized(employees.ids)
+
+    @api.multi
+    def write(self, vals):
+        res = super().write(vals)
+        if 'tz' in vals:
+            self._refresh_theoretical_time_report()
+        return res
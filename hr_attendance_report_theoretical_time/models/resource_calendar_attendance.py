@@ -0,0 +1,37 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, models
+
+
+class ResourceCalendarAttendance(models.Model):
+    _inherit = 'resource.calendar.attendance'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        calendars = records.mapped('calendar_id')
+        calendars._clear_theoretical_hours_cache()
+        calendars._refresh_theoretical_time_report()
+        return records
+
+    @api.multi
+    def write(self, vals):
+        if not {
+            'dayofweek', 'hour_from', 'hour_to', 'date_from', 'date_to',
+            'calendar_id',
+        } & set(vals):
+            return super().write(vals)
+        calendars = self.mapped('calendar_id')
+        res = super().write(vals)
+        calendars |= self.mapped('calendar_id')
+        calendars._clear_theoretical_hours_cache()
+        calendars._refresh_theoretical_time_report()
+        return res
+
+    @api.multi
+    def unlink(self):
+        calendars = self.mapped('calendar_id')
+        res = super().unlink()
+        calendars._clear_theoretical_hours_cache()
+        calendars._refresh_theoretical_time_report()
+        return res
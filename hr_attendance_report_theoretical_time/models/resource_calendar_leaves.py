@@ -0,0 +1,87 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from datetime import timedelta
+
+from odoo import api, models
+
+
+class ResourceCalendarLeaves(models.Model):
+    _inherit = 'resource.calendar.leaves'
+
+    def _get_theoretical_time_report_spans(self):
+        """Get the employees and days of the materialized report affected by
+        these leaves. Leaves of employees are refreshed through their
+        hr.leave instead.
+
+        :return: List of tuples (employee IDs, date from, date to).
+        """
+        obj = self.env['hr.attendance.theoretical.time.report']
+        if not self or not obj._is_materialized():
+            return []
+        employee_obj = self.env['hr.employee'].with_context(active_test=False)
+        spans = []
+        for leave in self.filtered(
+            lambda x: not x.holiday_id and x.date_from and x.date_to
+        ):
+            if leave.resource_id:
+                domain = [('resource_id', '=', leave.resource_id.id)]
+            elif leave.calendar_id:
+                domain = [('resource_calendar_id', '=', leave.calendar_id.id)]
+            else:
+                domain = []
+            # Datetimes are in UTC, so the local dates can be one day apart
+            spans.append((
+                employee_obj.search(domain).ids,
+                leave.date_from.date() - timedelta(days=1),
+                leave.date_to.date() + timedelta(days=1),
+            ))
+        return spans
+
+    def _get_theoretical_cached_calendars(self):
+        """Get the working schedules whose cached working intervals include
+        these leaves: the ones not assigned to any resource nor coming from
+        a leave request."""
+        return self.filtered(
+            lambda x: not x.resource_id and not x.holiday_id
+        ).mapped('calendar_id')
+
+    @api.model
+    def _refresh_theoretical_time_report(self, spans):
+        """Refresh the materialized report rows of the given spans.
+
+        :param: spans: List of tuples (employee IDs, date from, date to).
+        """
+        obj = self.env['hr.attendance.theoretical.time.report']
+        for employee_ids, date_from, date_to in spans:
+            obj._refresh_materialized(employee_ids, date_from, date_to)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        calendars = records._get_theoretical_cached_calendars()
+        calendars._clear_theoretical_hours_cache()
+        self._refresh_theoretical_time_report(
+            records._get_theoretical_time_report_spans(),
+        )
+        return records
+
+    @api.multi
+    def write(self, vals):
+        spans = self._get_theoretical_time_report_spans()
+        calendars = self._get_theoretical_cached_calendars()
+        res = super().write(vals)
+        calendars |= self._get_theoretical_cached_calendars()
+        calendars._clear_theoretical_hours_cache()
+        self._refresh_theoretical_time_report(
+            spans + self._get_theoretical_time_report_spans(),
+        )
+        return res
+
+    @api.multi
+    def unlink(self):
+        spans = self._get_theoretical_time_report_spans()
+        calendars = self._get_theoretical_cached_calendars()
+        res = super().unlink()
+        calendars._clear_theoretical_hours_cache()
+        self._refresh_theoretical_time_report(spans)
+        return res
@@ -2,7 +2,9 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
 from odoo import api, fields, models, tools
-from datetime import datetime, time
+from odoo.addons.resource.models.resource import Intervals
+from collections import defaultdict
+from datetime import datetime, time, timedelta
 from psycopg2.extensions import AsIs
 import pytz
 
@@ -138,67 +140,394 @@ class HrAttendanceTheoreticalTimeReport(models.Model):
             date
             """
 
-    @api.model_cr
-    def init(self):
-        tools.drop_view_if_exists(self.env.cr, self._table)
-        self.env.cr.execute(
+    def _query(self, where_sub1="True", where_sub2="True"):
+        """Return the full SQL query of the report.
+
+        :param: where_sub1: Extra SQL condition for the attendances part.
+        :param: where_sub2: Extra SQL condition for the generated days part.
+        :return: SQL query as string, without parameters to be filled.
+        """
+        return self.env.cr.mogrify(
             """
-CREATE or REPLACE VIEW %s as (
     SELECT %s
     FROM (
         (
             SELECT %s
             FROM %s
-            WHERE %s
+            WHERE (%s) AND (%s)
         )
         UNION (
             SELECT %s
             FROM %s
-            WHERE %s
+            WHERE (%s) AND (%s)
         )
     ) AS u
     GROUP BY %s
-)
             """, (
-                AsIs(self._table),
                 AsIs(self._select()),
                 AsIs(self._select_sub1()),
                 AsIs(self._from_sub1()),
                 AsIs(self._where_sub1()),
+                AsIs(where_sub1),
                 AsIs(self._select_sub2()),
                 AsIs(self._from_sub2()),
                 AsIs(self._where_sub2()),
+                AsIs(where_sub2),
                 AsIs(self._group_by()),
             )
+        ).decode()
+
+    @api.model
+    def _is_materialized(self):
+        """Tell if the report is stored in a real table instead of a view.
+        It depends on what was built on the last module update, not on the
+        current value of the system parameter.
+        """
+        return tools.table_kind(self.env.cr, self._table) == 'r'
+
+    @api.model_cr
+    def init(self):
+        cr = self.env.cr
+        if tools.table_kind(cr, self._table) == 'r':
+            cr.execute("DROP TABLE %s", (AsIs(self._table), ))
+        tools.drop_view_if_exists(cr, self._table)
+        materialized = tools.str2bool(
+            self.env['ir.config_parameter'].sudo().get_param(
+                'hr_attendance_report_theoretical_time.materialized', 'False',
+            ),
+            False,
+        )
+        if not materialized:
+            cr.execute("CREATE or REPLACE VIEW %s as (%s)", (
+                AsIs(self._table), AsIs(self._query()),
+            ))
+            return
+        cr.execute("CREATE TABLE %s AS (%s)", (
+            AsIs(self._table), AsIs(self._query()),
+        ))
+        cr.execute("CREATE UNIQUE INDEX %s ON %s (employee_id, date)", (
+            AsIs('%s_employee_id_date_uniq' % self._table),
+            AsIs(self._table),
+        ))
+        self._store_generated_hours()
+        self.env['ir.config_parameter'].sudo().set_param(
+            'hr_attendance_report_theoretical_time.materialized_date',
+            fields.Date.to_string(fields.Date.today()),
+        )
+
+    def _refresh_where(self, employee_column, date_column, employee_ids=None,
+                       date_from=None, date_to=None):
+        """Build the SQL condition restricting a refresh of the materialized
+        report to the given employees and dates.
+        """
+        cr = self.env.cr
+        where = ["True"]
+        if employee_ids is not None:
+            where.append(cr.mogrify(
+                employee_column + " IN %s", (tuple(employee_ids), ),
+            ).decode())
+        if date_from:
+            where.append(cr.mogrify(
+                date_column + " >= %s", (date_from, ),
+            ).decode())
+        if date_to:
+            where.append(cr.mogrify(
+                date_column + " <= %s", (date_to, ),
+            ).decode())
+        return " AND ".join(where)
+
+    @api.model
+    def _refresh_materialized(self, employee_ids=None, date_from=None,
+                              date_to=None):
+        """Recompute the rows of the materialized report for the given
+        employees and dates. Nothing is done if the report is a view.
+
+        :param: employee_ids: Employee IDs to refresh. All if None.
+        :param: date_from: First date to refresh. No limit if not set.
+        :param: date_to: Last date to refresh. No limit if not set.
+        """
+        if not self._is_materialized():
+            return
+        if employee_ids is not None and not employee_ids:
+            return
+        args = (employee_ids, date_from, date_to)
+        cr = self.env.cr
+        cr.execute("DELETE FROM %s WHERE %s", (
+            AsIs(self._table),
+            AsIs(self._refresh_where('employee_id', 'date', *args)),
+        ))
+        cr.execute("INSERT INTO %s (%s)", (
+            AsIs(self._table),
+            AsIs(self._query(
+                where_sub1=self._refresh_where(
+                    'ha.employee_id', 'ha.check_in::date', *args
+                ),
+                where_sub2=self._refresh_where('he.id', 'gs::date', *args),
+            )),
+        ))
+        self._store_generated_hours(
+            self._refresh_where('employee_id', 'date', *args),
+        )
+        self.invalidate_cache(fnames=[
+            'employee_id', 'date', 'worked_hours', 'theoretical_hours',
+            'difference',
+        ])
+
+    @api.model
+    def _store_generated_hours(self, where="True"):
+        """Compute and store in the materialized report the theoretical hours
+        of the generated non worked days, so they are not computed again
+        each time the report is opened. They are computed in batch by year.
+
+        :param: where: SQL condition restricting the rows to compute.
+        """
+        cr = self.env.cr
+        cr.execute(
+            "SELECT employee_id, date FROM %s "
+            "WHERE theoretical_hours < 0 AND (%s)",
+            (AsIs(self._table), AsIs(where)),
+        )
+        missing = defaultdict(lambda: defaultdict(set))
+        for employee_id, date in cr.fetchall():
+            missing[date.year][employee_id].add(date)
+        employee_obj = self.env['hr.employee'].sudo()
+        for year in sorted(missing):
+            dates_by_employee = missing[year]
+            dates = set().union(*dates_by_employee.values())
+            hours = self._theoretical_hours_batch(
+                employee_obj.browse(sorted(dates_by_employee)),
+                min(dates), max(dates),
+            )
+            values = [
+                cr.mogrify("(%s, %s, %s)", (
+                    employee_id, date, hours.get((employee_id, date), 0.0),
+                )).decode()
+                for employee_id, dates in dates_by_employee.items()
+                for date in dates
+            ]
+            for chunk in tools.split_every(1000, values):
+                cr.execute(
+                    """
+                    UPDATE %s AS r
+                    SET theoretical_hours = v.hours
+                    FROM (VALUES %s) AS v (employee_id, date, hours)
+                    WHERE r.employee_id = v.employee_id AND r.date = v.date
+                    """,
+                    (AsIs(self._table), AsIs(", ".join(chunk))),
+                )
+
+    @api.model
+    def _cron_refresh_materialized(self):
+        """Generate the days elapsed since the last execution, as the report
+        only includes non attended days until the current date.
+        """
+        if not self._is_materialized():
+            return
+        param_obj = self.env['ir.config_parameter'].sudo()
+        key = 'hr_attendance_report_theoretical_time.materialized_date'
+        today = fields.Date.to_string(fields.Date.today())
+        self._refresh_materialized(
+            date_from=param_obj.get_param(key) or today, date_to=today,
         )
+        param_obj.set_param(key, today)
 
-    # TODO: To be activated for performance assuring cache clearing on changes
-    # @tools.ormcache('employee.id', 'date')
     @api.model
     def _theoretical_hours(self, employee, date):
         """Get theoretical working hours for the day where the check-in is
         done for that employee.
         """
-        if not employee.resource_id.calendar_id:
-            return 0
-        tz = employee.resource_id.calendar_id.tz
-        return employee.with_context(
-            exclude_public_holidays=True,
-            employee_id=employee.id,
-        ).get_work_days_data(
-            datetime.combine(date, time(0, 0, 0, 0, tzinfo=pytz.timezone(tz))),
-            datetime.combine(
-                date, time(23, 59, 59, 99999, tzinfo=pytz.timezone(tz))
-            ),
-            # Pass this domain for excluding leaves whose type is included in
-            # theoretical hours
-            domain=[
+        if isinstance(date, datetime):
+            date = date.date()
+        return self._theoretical_hours_batch(employee, date, date).get(
+            (employee.id, date), 0,
+        )
+
+    @api.model
+    def _theoretical_hours_batch(self, employees, date_from, date_to):
+        """Get theoretical working hours of each day of a range of dates for
+        several employees at once. Working schedule attendances and leaves
+        of the whole schedule are only computed once per working schedule
+        and timezone through `_theoretical_intervals`, and the other leaves
+        and public holidays once per group of employees sharing them.
+
+        :param: employees: Employees recordset.
+        :param: date_from: First date of the range.
+        :param: date_to: Last date of the range.
+        :return: Dictionary with (employee ID, date) as keys and theoretical
+          hours as values.
+        """
+        days = [
+            date_from + timedelta(days=x)
+            for x in range((date_to - date_from).days + 1)
+        ]
+        res = {}
+        groups = defaultdict(list)
+        for employee in employees.sudo():
+            for day in days:
+                res[(employee.id, day)] = 0.0
+            resource = employee.resource_id
+            if resource.calendar_id:
+                address = employee.address_id
+                groups[(
+                    resource.calendar_id, resource.tz,
+                    address.country_id.id, address.state_id.id,
+                )].append(employee.id)
+        for key, employee_ids in groups.items():
+            calendar = key[0]
+            group = self.env['hr.employee'].sudo().browse(employee_ids)
+            intervals = Intervals([
+                (start, stop, self.env['resource.calendar.leaves'])
+                for start, stop in self._theoretical_intervals(
+                    calendar, group[0].resource_id, date_from, date_to,
+                )
+            ])
+            leaves = self._theoretical_leave_intervals(
+                calendar, group, date_from, date_to,
+            )
+            for employee in group:
+                for start, stop, meta in intervals - leaves[employee.id]:
+                    day_key = (employee.id, start.date())
+                    if day_key in res:
+                        res[day_key] += (stop - start).total_seconds() / 3600
+        return res
+
+    @api.model
+    def _theoretical_range(self, calendar, date_from, date_to):
+        """Get the timezone aware datetimes limiting a range of dates in the
+        timezone of the working schedule.
+        """
+        tz = pytz.timezone(calendar.tz)
+        return (
+            tz.localize(datetime.combine(date_from, time.min)),
+            tz.localize(datetime.combine(date_to, time.max)),
+        )
+
+    @api.model
+    @tools.ormcache(
+        'calendar.id',
+        'calendar.tz',
+        'calendar.theoretical_hours_version',
+        'resource.tz',
+        'date_from',
+        'date_to',
+    )
+    def _theoretical_intervals(self, calendar, resource, date_from, date_to):
+        """Get the working intervals of a working schedule for a range of
+        dates, once removed its leaves not assigned to any resource nor
+        coming from a leave request. Only the timezone of the resource is
+        used, so the result is shared by all the resources having the same
+        one. It is cached until the version of the working schedule changes
+        (see `resource.calendar._clear_theoretical_hours_cache`).
+
+        :param: calendar: Working schedule.
+        :param: resource: Resource giving the timezone.
+        :param: date_from: First date of the range.
+        :param: date_to: Last date of the range.
+        :return: Tuple of tuples (start datetime, end datetime).
+        """
+        start_dt, end_dt = self._theoretical_range(
+            calendar, date_from, date_to,
+        )
+        attendances = calendar._attendance_intervals(
+            start_dt, end_dt, resource,
+        )
+        leaves = self._theoretical_calendar_leaves(
+            calendar, resource.browse(), start_dt, end_dt,
+            pytz.timezone(resource.tz or calendar.tz),
+        )
+        return tuple(
+            (start, stop) for start, stop, meta in attendances - leaves[False]
+        )
+
+    @api.model
+    def _theoretical_calendar_leaves(self, calendar, resources, start_dt,
+                                     end_dt, tz):
+        """Get the leaves of a working schedule not counting as theoretical
+        time, with only one query.
+
+        :param: calendar: Working schedule.
+        :param: resources: Resources whose leaves are searched, plus the ones
+          of leave requests not assigned to any resource. If empty, only the
+          other leaves not assigned to any resource are searched.
+        :param: start_dt: Initial timezone aware datetime.
+        :param: end_dt: End timezone aware datetime.
+        :param: tz: Timezone of the returned intervals.
+        :return: Dictionary with resource ID (False for the leaves not
+          assigned to any resource) as key and leave intervals as value.
+        """
+        if resources:
+            resource_domain = [
                 '|',
+                ('resource_id', 'in', resources.ids),
+                '&',
+                ('resource_id', '=', False),
+                ('holiday_id', '!=', False),
+            ]
+        else:
+            resource_domain = [
+                ('resource_id', '=', False),
                 ('holiday_id', '=', False),
-                ('holiday_id.holiday_status_id.include_in_theoretical',
-                 '=', False),
-            ],
-        )['hours']
+            ]
+        # Leaves whose type is included in theoretical hours are excluded
+        leaves = self.env['resource.calendar.leaves'].sudo().search([
+            '|',
+            ('holiday_id', '=', False),
+            ('holiday_id.holiday_status_id.include_in_theoretical', '=',
+             False),
+            ('calendar_id', '=', calendar.id),
+            ('date_from', '<=', fields.Datetime.to_string(
+                end_dt.astimezone(pytz.utc))),
+            ('date_to', '>=', fields.Datetime.to_string(
+                start_dt.astimezone(pytz.utc))),
+        ] + resource_domain)
+        leaves_by_resource = defaultdict(list)
+        for leave in leaves:
+            leaves_by_resource[leave.resource_id.id].append((
+                max(start_dt.astimezone(tz),
+                    leave.date_from.replace(tzinfo=pytz.utc).astimezone(tz)),
+                min(end_dt.astimezone(tz),
+                    leave.date_to.replace(tzinfo=pytz.utc).astimezone(tz)),
+                leave,
+            ))
+        return defaultdict(Intervals, {
+            resource_id: Intervals(intervals)
+            for resource_id, intervals in leaves_by_resource.items()
+        })
+
+    @api.model
+    def _theoretical_leave_intervals(self, calendar, employees, date_from,
+                                     date_to):
+        """Get the intervals not counting as theoretical time for several
+        employees sharing the same working schedule, timezone and location,
+        apart from the ones of `_theoretical_intervals`: their leaves and
+        the public holidays.
+
+        :param: calendar: Working schedule of the employees.
+        :param: employees: Employees recordset.
+        :param: date_from: First date of the range.
+        :param: date_to: Last date of the range.
+        :return: Dictionary with employee ID as key and leave intervals as
+          value.
+        """
+        start_dt, end_dt = self._theoretical_range(
+            calendar, date_from, date_to,
+        )
+        resources = employees.mapped('resource_id')
+        tz = pytz.timezone(resources[:1].tz or calendar.tz)
+        leaves = self._theoretical_calendar_leaves(
+            calendar, resources, start_dt, end_dt, tz,
+        )
+        # Only the limits are used, so the public holidays are given the
+        # same type of metadata as the leaves for merging them
+        common = leaves[False] | Intervals([
+            (start, stop, self.env['resource.calendar.leaves'])
+            for start, stop, meta in calendar._public_holidays_leave_intervals(
+                start_dt, end_dt, employees[:1].id, tz,
+            )
+        ])
+        return {
+            x.id: leaves[x.resource_id.id] | common for x in employees
+        }
 
     @api.model
     def read_group(self, domain, fields, groupby, offset=0, limit=None,
@@ -220,19 +549,30 @@ CREATE or REPLACE VIEW %s as (
             'difference',
         })
         difference_field = 'difference' in fields
+        lines_hours = []
+        missing = defaultdict(set)
         for line in res:
             day_dict = {}
             records = self.search(line.get('__domain', domain))
             for record in records:
                 key = (record.employee_id.id, record.date)
                 if key not in day_dict:
+                    day_dict[key] = record.theoretical_hours
                     if record.theoretical_hours < 0:
-                        day_dict[key] = self._theoretical_hours(
-                            record.employee_id.sudo(), record.date,
-                        )
-                    else:
-                        day_dict[key] = record.theoretical_hours
-            line['theoretical_hours'] = sum(day_dict.values())
+                        missing[record.employee_id.id].add(record.date)
+            lines_hours.append(day_dict)
+        hours = {}
+        if missing:
+            dates = set().union(*missing.values())
+            hours = self._theoretical_hours_batch(
+                self.env['hr.employee'].sudo().browse(list(missing)),
+                min(dates), max(dates),
+            )
+        for line, day_dict in zip(res, lines_hours):
+            line['theoretical_hours'] = sum(
+                hours[key] if value < 0 else value
+                for key, value in day_dict.items()
+            )
             if full_fields:  # compute difference
                 line['difference'] = (
                     (line['worked_hours'] or 0.0) - line['theoretical_hours']
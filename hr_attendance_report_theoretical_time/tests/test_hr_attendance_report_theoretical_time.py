@@ -1,6 +1,9 @@
 # Copyright 2017-2019 Tecnativa - Pedro M. Baeza
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
+from datetime import date
+
+from odoo import tools
 from odoo.tests import common
 
 
@@ -189,6 +192,53 @@ class TestHrAttendanceReportTheoreticalTime(common.SavepointCase):
         self.assertEqual(self.attendances[4].theoretical_hours, 8)
         self.assertEqual(self.attendances[12].theoretical_hours, 8)
 
+    def test_add_hr_holidays_public_lines(self):
+        self.public_holiday_global.line_ids = [
+            (0, 0, {'name': 'Christmas Eve', 'date': '1946-12-24'}),
+            (0, 0, {'name': 'Saint Stephen', 'date': '1946-12-26'}),
+        ]
+        # 1946-12-24
+        self.assertEqual(self.attendances[2].theoretical_hours, 0)
+        self.assertEqual(self.attendances[3].theoretical_hours, 0)
+        # 1946-12-26 - Employee 2
+        self.assertEqual(self.attendances[14].theoretical_hours, 0)
+        self.assertEqual(self.attendances[15].theoretical_hours, 0)
+
+    def test_deferred_recompute(self):
+        queue_obj = self.env['hr.attendance.theoretical.queue']
+        self.env['ir.config_parameter'].sudo().set_param(
+            'hr_attendance_report_theoretical_time.deferred_recompute', 'True',
+        )
+        self.public_holiday_global.line_ids[0].write({
+            'date': '1946-12-23',
+        })
+        self.leave.action_refuse()
+        # Not recomputed yet
+        self.assertEqual(self.attendances[0].theoretical_hours, 8)
+        self.assertEqual(self.attendances[4].theoretical_hours, 0)
+        self.assertEqual(self.attendances[6].theoretical_hours, 0)
+        self.assertEqual(len(queue_obj.search([])), 3)
+        queue_obj._cron_process_queue()
+        self.assertFalse(queue_obj.search([]))
+        self.assertEqual(self.attendances[0].theoretical_hours, 0)
+        self.assertEqual(self.attendances[4].theoretical_hours, 8)
+        self.assertEqual(self.attendances[6].theoretical_hours, 8)
+
+    def test_coalesce_spans(self):
+        queue_obj = self.env['hr.attendance.theoretical.queue']
+        spans = queue_obj._coalesce_spans([
+            (1, date(1946, 12, 1), date(1946, 12, 5)),
+            (1, date(1946, 12, 6), date(1946, 12, 8)),
+            (1, date(1946, 12, 3), date(1946, 12, 4)),
+            (1, date(1946, 12, 20), date(1946, 12, 20)),
+            (False, date(1946, 12, 25), date(1946, 12, 25)),
+        ])
+        self.assertEqual(sorted(spans, key=lambda x: (x[0], x[1])), [
+            (False, date(1946, 12, 25), date(1946, 12, 25)),
+            (1, date(1946, 12, 1), date(1946, 12, 8)),
+            (1, date(1946, 12, 20), date(1946, 12, 20)),
+        ])
+
     def test_change_hr_holidays(self):
         self.leave.action_refuse()
         # 1946-12-26 - Employee 2
@@ -200,3 +250,109 @@ class TestHrAttendanceReportTheoreticalTime(common.SavepointCase):
         # 1946-12-26 - Employee 1
         a = self.attendances[6]
         self.assertEqual(obj._theoretical_hours(a.employee_id, a.check_in), 8)
+        # Stored hours are left to the scheduled action
+        self.assertTrue(self.env['hr.attendance.theoretical.queue'].search([
+            ('employee_id', '=', self.employee_1.id),
+        ]))
+
+    def test_theoretical_hours_batch(self):
+        obj = self.env['hr.attendance.theoretical.time.report']
+        res = obj._theoretical_hours_batch(
+            self.employee_1 | self.employee_2,
+            date(1946, 12, 23), date(1946, 12, 29),
+        )
+        self.assertEqual(len(res), 14)
+        # EMPLOYEE 1
+        self.assertEqual(res[(self.employee_1.id, date(1946, 12, 23))], 8)
+        self.assertEqual(res[(self.employee_1.id, date(1946, 12, 24))], 8)
+        self.assertEqual(res[(self.employee_1.id, date(1946, 12, 25))], 0)
+        self.assertEqual(res[(self.employee_1.id, date(1946, 12, 26))], 0)
+        self.assertEqual(res[(self.employee_1.id, date(1946, 12, 27))], 8)
+        self.assertEqual(res[(self.employee_1.id, date(1946, 12, 28))], 0)
+        # EMPLOYEE 2
+        self.assertEqual(res[(self.employee_2.id, date(1946, 12, 23))], 0)
+        self.assertEqual(res[(self.employee_2.id, date(1946, 12, 24))], 0)
+        self.assertEqual(res[(self.employee_2.id, date(1946, 12, 25))], 0)
+        self.assertEqual(res[(self.employee_2.id, date(1946, 12, 26))], 8)
+        self.assertEqual(res[(self.employee_2.id, date(1946, 12, 29))], 0)
+
+    def test_theoretical_hours_cache(self):
+        obj = self.env['hr.attendance.theoretical.time.report']
+        day = date(1946, 12, 27)
+        self.assertEqual(obj._theoretical_hours(self.employee_1, day), 8)
+        # Leaves of employees don't outdate the cache of the schedule
+        version = self.calendar.theoretical_hours_version
+        self.env['resource.calendar.leaves'].create({
+            'name': 'Employee leave',
+            'calendar_id': self.calendar.id,
+            'resource_id': self.employee_2.resource_id.id,
+            'date_from': '1946-12-27 08:00:00',
+            'date_to': '1946-12-27 12:00:00',
+        })
+        self.assertEqual(self.calendar.theoretical_hours_version, version)
+        self.assertEqual(obj._theoretical_hours(self.employee_2, day), 4)
+        self.calendar.attendance_ids.filtered(
+            lambda x: x.dayofweek == '4' and x.hour_from == 8
+        ).hour_to = 10
+        self.assertNotEqual(self.calendar.theoretical_hours_version, version)
+        self.assertEqual(obj._theoretical_hours(self.employee_1, day), 6)
+        self.public_holiday_global.line_ids[0].date = day
+        self.assertEqual(obj._theoretical_hours(self.employee_1, day), 0)
+        # Location of the employee
+        day = date(1946, 12, 24)
+        self.assertEqual(obj._theoretical_hours(self.employee_2, day), 0)
+        self.address_2.write({
+            'country_id': self.address_1.country_id.id,
+            'state_id': False,
+        })
+        self.assertEqual(obj._theoretical_hours(self.employee_2, day), 8)
+
+    def test_materialized_report(self):
+        obj = self.env['hr.attendance.theoretical.time.report']
+        self.env['ir.config_parameter'].sudo().set_param(
+            'hr_attendance_report_theoretical_time.materialized', 'True',
+        )
+        # The mode only changes when the report is built again
+        self.assertFalse(obj._is_materialized())
+        obj.init()
+        self.assertTrue(obj._is_materialized())
+        self.assertEqual(tools.table_kind(self.env.cr, obj._table), 'r')
+        # Hours of non worked days are stored
+        self.env.cr.execute(
+            "SELECT count(*) FROM %s WHERE theoretical_hours < 0" % obj._table
+        )
+        self.assertFalse(self.env.cr.fetchone()[0])
+        domain = [
+            ('date', '>=', '1946-12-23'),
+            ('date', '<', '1946-12-31'),
+            ('employee_id', 'in', (self.employee_1.id, self.employee_2.id)),
+        ]
+        fields = [
+            'employee_id', 'theoretical_hours', 'worked_hours', 'difference',
+        ]
+        res = obj.read_group(domain, fields, ['employee_id'])
+        self.assertEqual(res[0]['theoretical_hours'], 32)
+        self.assertEqual(res[0]['worked_hours'], 32)
+        self.assertEqual(res[1]['theoretical_hours'], 24)
+        self.assertEqual(res[1]['worked_hours'], 32)
+        # Refreshed on attendance changes
+        self.attendances[0].unlink()
+        self.attendances[8].check_out = '1946-12-23 10:00:00'
+        res = obj.read_group(domain, fields, ['employee_id'])
+        self.assertEqual(res[0]['worked_hours'], 28)
+        self.assertEqual(res[1]['worked_hours'], 30)
+        # Refreshed on working schedule changes
+        self.calendar.attendance_ids.filtered(
+            lambda x: x.dayofweek == '4'
+        ).unlink()
+        res = obj.read_group(domain, fields, ['employee_id'])
+        self.assertEqual(res[0]['theoretical_hours'], 24)
+        self.assertEqual(res[1]['theoretical_hours'], 16)
+        # Refreshed on public holidays changes
+        self.public_holiday_global.line_ids = [(0, 0, {
+            'name': 'New Year eve eve',
+            'date': '1946-12-30',
+        })]
+        res = obj.read_group(domain, fields, ['employee_id'])
+        self.assertEqual(res[0]['theoretical_hours'], 16)
+        self.assertEqual(res[1]['theoretical_hours'], 8)
@@ -4,7 +4,7 @@
 
 {
     'name': 'HR Attendance RFID',
-    'version': '12.0.1.0.0',
+    'version': '12.0.1.2.0',
     'category': 'Human Resources',
     'website': 'https://github.com/OCA/hr',
     'author': 'Comunitea,'
@@ -20,5 +20,8 @@
         'security/hr_attendance_rfid.xml',
         'security/ir.model.access.csv',
         'views/hr_employee_view.xml',
+        'views/hr_attendance_rfid_event_views.xml',
+        'views/hr_attendance_rfid_stats_views.xml',
+        'data/ir_cron.xml',
     ],
 }
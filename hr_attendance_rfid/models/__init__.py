@@ -1 +1,4 @@
 from . import hr_employee
+from . import hr_attendance_rfid_event
+from . import hr_attendance_rfid_timing
+from . import hr_attendance_rfid_stats
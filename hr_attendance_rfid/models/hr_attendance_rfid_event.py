@@ -0,0 +1,204 @@
+# License AGPL-3 - See http://www.gnu.org/licenses/agpl-3.0.html
+
+from odoo import api, fields, models, _
+
+
+class HrAttendanceRfidEvent(models.Model):
+    _name = 'hr.attendance.rfid.event'
+    _description = 'Journal of RFID card swipes'
+    _order = 'timestamp desc, id desc'
+    _rec_name = 'event_uid'
+    _sql_constraints = [(
+        'event_uid_uniq',
+        'UNIQUE(event_uid)',
+        'The event ID should be unique.'
+    )]
+
+    event_uid = fields.Char(
+        string="Event ID",
+        required=True,
+        readonly=True,
+        help="Unique identifier given by the reader to the swipe.",
+    )
+    rfid_card_code = fields.Char(
+        string="RFID Card Code",
+        readonly=True,
+    )
+    timestamp = fields.Datetime(
+        required=True,
+        readonly=True,
+        index=True,
+        help="Time of the swipe, as recorded by the reader.",
+    )
+    reader_id = fields.Char(
+        string="Reader",
+        readonly=True,
+    )
+    state = fields.Selection(
+        selection=[
+            ('pending', 'Pending'),
+            ('done', 'Done'),
+            ('error', 'Error'),
+        ],
+        default='pending',
+        required=True,
+        readonly=True,
+        index=True,
+    )
+    employee_id = fields.Many2one(
+        comodel_name='hr.employee',
+        string="Employee",
+        ondelete='set null',
+        readonly=True,
+    )
+    action = fields.Char(
+        readonly=True,
+    )
+    error_message = fields.Text(
+        readonly=True,
+    )
+
+    @api.model
+    def _store_events(self, events):
+        """ Store the given swipes in the journal, skipping the ones whose
+        event ID was already received. The swipes are inserted with a
+        single query letting the database skip the existing event IDs, so
+        concurrent uploads of the same buffer can't store them twice.
+        :param events: list of (event_uid, card_code, timestamp, reader_id)
+            where timestamp is an UTC datetime string
+        :returns: tuple (new events recordset, dictionary of the already
+            stored events by event ID, dictionary of the error messages of
+            the invalid events by their index in the list)
+        """
+        self.check_access_rights('create')
+        cr = self.env.cr
+        values = []
+        seen = set()
+        errors = {}
+        for index, event in enumerate(events):
+            # Invalid events would make the whole insert fail
+            error = self._check_event(event)
+            if error:
+                errors[index] = error
+                continue
+            event_uid, card_code, timestamp, reader_id = event
+            if event_uid in seen:
+                continue
+            seen.add(event_uid)
+            values.append(cr.mogrify(
+                "(%s, %s, %s, %s, 'pending', %s, %s,"
+                " now() at time zone 'UTC', now() at time zone 'UTC')",
+                (event_uid, card_code, fields.Datetime.to_datetime(timestamp),
+                 reader_id or None, self.env.uid, self.env.uid),
+            ).decode())
+        new_ids = []
+        if values:
+            cr.execute("""
+                INSERT INTO %s (
+                    event_uid, rfid_card_code, timestamp, reader_id, state,
+                    create_uid, write_uid, create_date, write_date
+                )
+                VALUES %s
+                ON CONFLICT (event_uid) DO NOTHING
+                RETURNING id
+                """ % (self._table, ', '.join(values)))
+            new_ids = [row[0] for row in cr.fetchall()]
+        new_events = self.browse(new_ids)
+        # The skipped ones were already stored
+        existing = self.search([
+            ('event_uid', 'in', list(seen - set(
+                new_events.mapped('event_uid')))),
+        ])
+        return new_events, {x.event_uid: x for x in existing}, errors
+
+    @api.model
+    def _check_event(self, event):
+        """ Check a swipe before storing it in the journal.
+        :param event: tuple (event_uid, card_code, timestamp, reader_id)
+        :returns: error message, or None if the event is valid
+        """
+        try:
+            event_uid, card_code, timestamp, reader_id = event
+        except (TypeError, ValueError):
+            return _('Invalid event %s') % (event, )
+        if not event_uid:
+            return _('Missing event ID')
+        if not card_code:
+            return _('Missing card code')
+        if not timestamp:
+            return _('Missing timestamp')
+        try:
+            fields.Datetime.to_datetime(timestamp)
+        except (TypeError, ValueError):
+            return _('Invalid timestamp %s') % timestamp
+        return None
+
+    @api.model
+    def _get_error_result(self, event, error_message):
+        """ Returns the outcome of an event that couldn't be stored, with the
+        same keys as `_get_result`.
+        """
+        if not isinstance(event, (list, tuple)):
+            event = ()
+        event = tuple(event) + (False, ) * 4
+        return {
+            'event_id': event[0] or False,
+            'duplicate': False,
+            'rfid_card_code': event[1] or '',
+            'employee_name': '',
+            'employee_id': False,
+            'error_message': error_message,
+            'logged': False,
+            'action': 'FALSE',
+            'timestamp': event[2] or False,
+            'reader_id': event[3] or False,
+        }
+
+    @api.multi
+    def _replay(self):
+        """ Register the attendances of the pending events in chronological
+        order and record the outcome of each one.
+        """
+        events = self.filtered(lambda x: x.state == 'pending').sorted(
+            key=lambda x: (x.timestamp, x.id))
+        if not events:
+            return
+        results = self.env['hr.employee'].register_attendances([
+            (x.rfid_card_code, x.timestamp, x.reader_id) for x in events
+        ])
+        for event, res in zip(events, results):
+            event.write({
+                'state': 'done' if res['logged'] else 'error',
+                'employee_id': res['employee_id'] or False,
+                'action': res['action'],
+                'error_message': res['error_message'] and str(
+                    res['error_message']) or False,
+            })
+
+    @api.multi
+    def _get_result(self, duplicate=False):
+        """ Returns the outcome of the event with the keys of
+        `register_attendances` plus:
+            'event_id': char
+            'duplicate': boolean
+        """
+        self.ensure_one()
+        return {
+            'event_id': self.event_uid,
+            'duplicate': duplicate,
+            'rfid_card_code': self.rfid_card_code,
+            'employee_name': self.employee_id.name or '',
+            'employee_id': self.employee_id.id or False,
+            'error_message': self.error_message or '',
+            'logged': self.state == 'done',
+            'action': self.action or 'FALSE',
+            'timestamp': fields.Datetime.to_string(self.timestamp),
+            'reader_id': self.reader_id,
+        }
+
+    @api.multi
+    def action_replay(self):
+        """ Replay again the events that failed. """
+        events = self.filtered(lambda x: x.state == 'error')
+        events.write({'state': 'pending'})
+        events._replay()
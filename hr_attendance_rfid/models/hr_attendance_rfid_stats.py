@@ -0,0 +1,93 @@
+# License AGPL-3 - See http://www.gnu.org/licenses/agpl-3.0.html
+
+from odoo import api, fields, models, tools
+
+PERCENTILE_HELP = (
+    "Percentile of the swipes of each hour. When grouping several hours, "
+    "the highest hourly value is shown, not the percentile of the group."
+)
+
+
+class HrAttendanceRfidStats(models.Model):
+    _name = 'hr.attendance.rfid.stats'
+    _description = 'Hourly statistics of RFID card swipes'
+    _auto = False
+    _rec_name = 'hour'
+    _order = 'hour desc, reader_id'
+
+    reader_id = fields.Char(
+        string="Reader",
+        readonly=True,
+    )
+    hour = fields.Datetime(
+        readonly=True,
+    )
+    swipe_count = fields.Integer(
+        string="Swipes",
+        readonly=True,
+    )
+    not_found_count = fields.Integer(
+        string="No employee found",
+        readonly=True,
+    )
+    error_count = fields.Integer(
+        string="Errors",
+        readonly=True,
+    )
+    lookup_time_p95 = fields.Float(
+        string="Max hourly card lookup p95 (ms)",
+        readonly=True,
+        group_operator='max',
+        help=PERCENTILE_HELP,
+    )
+    action_time_p95 = fields.Float(
+        string="Max hourly check in/out p95 (ms)",
+        readonly=True,
+        group_operator='max',
+        help=PERCENTILE_HELP,
+    )
+    total_time_p50 = fields.Float(
+        string="Max hourly total p50 (ms)",
+        readonly=True,
+        group_operator='max',
+        help=PERCENTILE_HELP,
+    )
+    total_time_p95 = fields.Float(
+        string="Max hourly total p95 (ms)",
+        readonly=True,
+        group_operator='max',
+        help=PERCENTILE_HELP,
+    )
+    total_time_p99 = fields.Float(
+        string="Max hourly total p99 (ms)",
+        readonly=True,
+        group_operator='max',
+        help=PERCENTILE_HELP,
+    )
+
+    @api.model_cr
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute("""
+            CREATE OR REPLACE VIEW %s AS (
+                SELECT
+                    min(id) AS id,
+                    reader_id,
+                    date_trunc('hour', date) AS hour,
+                    count(*) AS swipe_count,
+                    count(*) FILTER (
+                        WHERE result = 'not_found') AS not_found_count,
+                    count(*) FILTER (WHERE result = 'error') AS error_count,
+                    percentile_cont(0.95) WITHIN GROUP (
+                        ORDER BY lookup_time) AS lookup_time_p95,
+                    percentile_cont(0.95) WITHIN GROUP (
+                        ORDER BY action_time) AS action_time_p95,
+                    percentile_cont(0.5) WITHIN GROUP (
+                        ORDER BY total_time) AS total_time_p50,
+                    percentile_cont(0.95) WITHIN GROUP (
+                        ORDER BY total_time) AS total_time_p95,
+                    percentile_cont(0.99) WITHIN GROUP (
+                        ORDER BY total_time) AS total_time_p99
+                FROM hr_attendance_rfid_timing
+                GROUP BY reader_id, date_trunc('hour', date)
+            )""" % self._table)
@@ -0,0 +1,86 @@
+# License AGPL-3 - See http://www.gnu.org/licenses/agpl-3.0.html
+
+from datetime import timedelta
+
+from odoo import api, fields, models, tools
+
+
+class HrAttendanceRfidTiming(models.Model):
+    _name = 'hr.attendance.rfid.timing'
+    _description = 'Timings of RFID card swipes'
+    _order = 'date desc, id desc'
+    _rec_name = 'date'
+    _log_access = False
+
+    date = fields.Datetime(
+        required=True,
+        readonly=True,
+        index=True,
+        default=fields.Datetime.now,
+    )
+    reader_id = fields.Char(
+        string="Reader",
+        readonly=True,
+    )
+    result = fields.Selection(
+        selection=[
+            ('done', 'Done'),
+            ('not_found', 'No employee found'),
+            ('error', 'Error'),
+        ],
+        required=True,
+        readonly=True,
+    )
+    lookup_time = fields.Float(
+        string="Card lookup (ms)",
+        readonly=True,
+    )
+    action_time = fields.Float(
+        string="Check in/out (ms)",
+        readonly=True,
+        help="Includes the recomputations triggered by the attendance.",
+    )
+    total_time = fields.Float(
+        string="Total (ms)",
+        readonly=True,
+    )
+
+    @api.model
+    def _is_enabled(self):
+        """ Tell if the timings of the swipes are recorded. """
+        return tools.str2bool(
+            self.env['ir.config_parameter'].sudo().get_param(
+                'hr_attendance_rfid.timing', 'False',
+            ),
+            False,
+        )
+
+    @api.model
+    def _log_swipe(self, reader_id, res, lookup_time, action_time):
+        """ Record the timing of a swipe, if enabled.
+        :param reader_id: identifier of the reader, if known
+        :param res: dictionary returned for the swipe
+        :param lookup_time: seconds spent searching the card
+        :param action_time: seconds spent checking in or out
+        """
+        if not self._is_enabled():
+            return
+        if res['logged']:
+            result = 'done'
+        elif not res['employee_id']:
+            result = 'not_found'
+        else:
+            result = 'error'
+        self.sudo().create({
+            'reader_id': reader_id or False,
+            'result': result,
+            'lookup_time': lookup_time * 1000,
+            'action_time': action_time * 1000,
+            'total_time': (lookup_time + action_time) * 1000,
+        })
+
+    @api.model
+    def _cron_purge(self, days=30):
+        """ Remove the timings older than the given number of days. """
+        date_limit = fields.Datetime.now() - timedelta(days=days)
+        self.search([('date', '<', date_limit)]).unlink()
@@ -3,7 +3,9 @@
 # License AGPL-3 - See http://www.gnu.org/licenses/agpl-3.0.html
 
 import logging
-from odoo import api, fields, models, _
+import time
+from odoo import api, fields, models, tools, _
+from odoo.exceptions import UserError, except_orm
 _logger = logging.getLogger(__name__)
 
 
@@ -18,9 +20,47 @@ class HrEmployee(models.Model):
 
     rfid_card_code = fields.Char("RFID Card Code")
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        if any(vals.get('rfid_card_code') for vals in vals_list):
+            self.clear_caches()
+        return res
+
+    @api.multi
+    def write(self, vals):
+        res = super().write(vals)
+        if {'rfid_card_code', 'active', 'name', 'company_id'} & set(vals):
+            self.clear_caches()
+        return res
+
+    @api.multi
+    def unlink(self):
+        res = super().unlink()
+        self.clear_caches()
+        return res
+
     @api.model
-    def register_attendance(self, card_code):
+    @tools.ormcache('self.env.uid', 'card_code')
+    def _get_rfid_card_employee_data(self, card_code):
+        """ Get the employee of a card, cached until card codes, names or
+        active states of employees change, so swipes usually don't need to
+        search the database.
+        :param card_code: code of the swiped card
+        :returns: tuple (employee ID, employee name, active) or None if no
+            employee has this card
+        """
+        employee = self.with_context(active_test=False).search(
+            [('rfid_card_code', '=', card_code)], limit=1)
+        if not employee:
+            return None
+        return employee.id, employee.name, employee.active
+
+    @api.model
+    def register_attendance(self, card_code, reader_id=False):
         """ Register the attendance of the employee.
+        :param card_code: code of the swiped card
+        :param reader_id: identifier of the reader, for the swipe statistics
         :returns: dictionary
             'rfid_card_code': char
             'employee_name': char
@@ -29,7 +69,119 @@ class HrEmployee(models.Model):
             'logged': boolean
             'action': check_in/check_out
         """
+        start = time.time()
+        data = self._get_rfid_card_employee_data(card_code)
+        lookup_time = time.time() - start
+        if data and data[2]:
+            return self._register_attendance_timed(
+                self.browse(data[0]), card_code, reader_id, lookup_time,
+                employee_name=data[1])
+        return self._register_attendance_timed(
+            self.browse(), card_code, reader_id, lookup_time)
+
+    @api.model
+    def register_attendances(self, events):
+        """ Register the attendances of several card swipes at once, as sent
+        by a reader flushing its buffer. All the cards are searched with a
+        single query and the swipes are processed in chronological order.
+        :param events: list of (card_code, timestamp, reader_id) where
+            timestamp is an UTC datetime string, or False for using the
+            current time
+        :returns: list of dictionaries in the same order as the events, with
+            the same keys as `register_attendance` plus:
+            'timestamp': char
+            'reader_id': reader_id of the event
+        """
+        start = time.time()
+        employees = self.search([
+            ('rfid_card_code', 'in', list({x[0] for x in events})),
+        ])
+        employees_by_code = {x.rfid_card_code: x for x in employees}
+        # The cards are searched at once, so share the time among the swipes
+        lookup_time = (time.time() - start) / (len(events) or 1)
+        now = fields.Datetime.now()
+        action_dates = [
+            x[1] and fields.Datetime.to_datetime(x[1]) or now for x in events
+        ]
+        results = [False] * len(events)
+        for index in sorted(
+                range(len(events)), key=lambda i: (action_dates[i], i)):
+            card_code, timestamp, reader_id = events[index]
+            res = self._register_attendance_timed(
+                employees_by_code.get(card_code, self.browse()),
+                card_code,
+                reader_id,
+                lookup_time,
+                action_date=timestamp and action_dates[index],
+            )
+            res.update({
+                'timestamp': fields.Datetime.to_string(action_dates[index]),
+                'reader_id': reader_id,
+            })
+            results[index] = res
+        return results
+
+    @api.model
+    def register_attendance_events(self, events):
+        """ Register card swipes buffered by a reader while it was offline.
+        The swipes are stored in a journal deduplicated by event ID, so
+        replaying the same buffer again doesn't check in or out the
+        employees twice, and the new ones are processed in chronological
+        order.
+        :param events: list of (event_id, card_code, timestamp, reader_id)
+            where timestamp is the UTC datetime string of the swipe
+        :returns: list of dictionaries in the same order as the events, with
+            the same keys as `register_attendances` plus:
+            'event_id': char
+            'duplicate': boolean, True if the event was already received
+            Invalid events are not stored and get an error message.
+        """
+        event_model = self.env['hr.attendance.rfid.event']
+        new_events, existing_by_uid, errors = event_model._store_events(
+            events)
+        new_events._replay()
+        new_by_uid = {x.event_uid: x for x in new_events}
+        results = []
+        for index, event in enumerate(events):
+            if index in errors:
+                results.append(
+                    event_model._get_error_result(event, errors[index]))
+                continue
+            event_uid = event[0]
+            if event_uid in new_by_uid:
+                # Later occurrences in the same buffer are duplicates
+                existing_by_uid[event_uid] = new_by_uid.pop(event_uid)
+                results.append(existing_by_uid[event_uid]._get_result())
+            else:
+                results.append(
+                    existing_by_uid[event_uid]._get_result(duplicate=True))
+        return results
+
+    @api.model
+    def _register_attendance_timed(self, employee, card_code, reader_id,
+                                   lookup_time, **kwargs):
+        """ Register the attendance of an already found employee through
+        `_register_attendance_employee` and record the timing of the swipe.
+        :param reader_id: identifier of the reader, if known
+        :param lookup_time: seconds spent searching the card
+        :returns: dictionary as described in `register_attendance`
+        """
+        start = time.time()
+        res = self._register_attendance_employee(employee, card_code, **kwargs)
+        self.env['hr.attendance.rfid.timing']._log_swipe(
+            reader_id, res, lookup_time, time.time() - start)
+        return res
 
+    @api.model
+    def _register_attendance_employee(self, employee, card_code,
+                                      action_date=None, employee_name=None):
+        """ Register the attendance of an already found employee.
+        :param employee: employee recordset, empty if not found
+        :param card_code: code of the swiped card
+        :param action_date: datetime of the swipe. Current time if not set
+        :param employee_name: name of the employee, if already known
+        :returns: dictionary as described in `register_attendance`
+        """
         res = {
             'rfid_card_code': card_code,
             'employee_name': '',
@@ -38,9 +190,9 @@ class HrEmployee(models.Model):
             'logged': False,
             'action': 'FALSE',
         }
-        employee = self.search([('rfid_card_code', '=', card_code)], limit=1)
         if employee:
-            res['employee_name'] = employee.name
+            employee_name = employee_name or employee.name
+            res['employee_name'] = employee_name
             res['employee_id'] = employee.id
         else:
             msg = _("No employee found with card %s") % card_code
@@ -48,9 +200,15 @@ class HrEmployee(models.Model):
             res['error_message'] = msg
             return res
         try:
-            attendance = employee.attendance_action_change()
+            # Don't keep partial changes of a failed swipe
+            with self.env.cr.savepoint():
+                if action_date:
+                    attendance = employee._attendance_action_change_at(
+                        action_date)
+                else:
+                    attendance = employee.attendance_action_change()
             if attendance:
-                msg = _('Attendance recorded for employee %s') % employee.name
+                msg = _('Attendance recorded for employee %s') % employee_name
                 _logger.debug(msg)
                 res['logged'] = True
                 if attendance.check_out:
@@ -60,11 +218,42 @@ class HrEmployee(models.Model):
                 return res
             else:
                 msg = _('No attendance was recorded for '
-                        'employee %s') % employee.name
+                        'employee %s') % employee_name
                 _logger.error(msg)
                 res['error_message'] = msg
                 return res
         except Exception as e:
-            res['error_message'] = e
-            _logger.error(e)
+            # The savepoint restores the database, but not the cached values
+            # used by the next swipes of the employee
+            self.env.cache.invalidate()
+            if isinstance(e, except_orm):
+                res['error_message'] = e.name
+            else:
+                res['error_message'] = tools.ustr(e)
+            _logger.error(res['error_message'])
         return res
+
+    @api.multi
+    def _attendance_action_change_at(self, action_date):
+        """ Check in or check out the employee at the given datetime instead
+        of the current one, as `attendance_action_change` does.
+        :param action_date: datetime of the check in or check out
+        :returns: hr.attendance record
+        """
+        self.ensure_one()
+        if self.attendance_state != 'checked_in':
+            return self.env['hr.attendance'].create({
+                'employee_id': self.id,
+                'check_in': action_date,
+            })
+        attendance = self.env['hr.attendance'].search([
+            ('employee_id', '=', self.id),
+            ('check_out', '=', False),
+        ], limit=1)
+        if not attendance:
+            raise UserError(_(
+                'Cannot perform check out on %s, could not find '
+                'corresponding check in.'
+            ) % self.name)
+        attendance.check_out = action_date
+        return attendance
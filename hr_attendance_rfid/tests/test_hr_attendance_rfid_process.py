@@ -53,3 +53,140 @@ class TestHrAttendance(TransactionCase):
         self.assertTrue(
             'rfid_card_code' in res and
             res['rfid_card_code'] == invalid_code)
+
+    def test_register_attendances(self):
+        """Batch of swipes from a reader buffer"""
+        employee_2 = self.browse_ref('hr.employee_mit')
+        employee_2.rfid_card_code = 'a1b2c3'
+        invalid_code = '029238d'
+        res = self.employee_model.register_attendances([
+            (self.rfid_card_code, '2018-01-01 17:00:00', 'reader_1'),
+            ('a1b2c3', '2018-01-01 08:05:00', 'reader_2'),
+            (self.rfid_card_code, '2018-01-01 08:00:00', 'reader_1'),
+            (invalid_code, '2018-01-01 08:10:00', 'reader_1'),
+        ])
+        self.assertEqual(len(res), 4)
+        self.assertEqual(res[0]['action'], 'check_out')
+        self.assertEqual(res[0]['reader_id'], 'reader_1')
+        self.assertEqual(res[1]['action'], 'check_in')
+        self.assertEqual(res[1]['employee_id'], employee_2.id)
+        self.assertEqual(res[2]['action'], 'check_in')
+        self.assertEqual(res[2]['timestamp'], '2018-01-01 08:00:00')
+        self.assertFalse(res[3]['logged'])
+        attendance = self.env['hr.attendance'].search([
+            ('employee_id', '=', self.test_employee.id),
+            ('check_in', '=', '2018-01-01 08:00:00'),
+        ])
+        self.assertEqual(
+            fields.Datetime.to_string(attendance.check_out),
+            '2018-01-01 17:00:00',
+        )
+
+    @mute_logger('odoo.addons.hr_attendance_rfid.models.hr_employee')
+    def test_register_attendances_failed_swipe(self):
+        """A failed swipe doesn't change the state used by the next ones"""
+        attendance = self.env['hr.attendance'].create({
+            'employee_id': self.test_employee.id,
+            'check_in': '2018-01-02 12:00:00',
+        })
+        res = self.employee_model.register_attendances([
+            (self.rfid_card_code, '2018-01-02 11:00:00', 'reader_1'),
+            (self.rfid_card_code, '2018-01-02 13:00:00', 'reader_1'),
+        ])
+        self.assertFalse(res[0]['logged'])
+        self.assertIsInstance(res[0]['error_message'], str)
+        self.assertFalse(res[0]['error_message'].startswith('('))
+        self.assertTrue(res[1]['logged'])
+        self.assertEqual(res[1]['action'], 'check_out')
+        self.assertEqual(
+            fields.Datetime.to_string(attendance.check_out),
+            '2018-01-02 13:00:00',
+        )
+
+    def test_card_code_cache(self):
+        """Card code changes are taken into account after being cached"""
+        new_code = '7c8d9e'
+        res = self.employee_model.register_attendance(new_code)
+        self.assertFalse(res['logged'])
+        self.test_employee.rfid_card_code = new_code
+        res = self.employee_model.register_attendance(new_code)
+        self.assertTrue(res['logged'])
+        self.assertEqual(res['employee_name'], self.test_employee.name)
+        res = self.employee_model.register_attendance(self.rfid_card_code)
+        self.assertFalse(res['logged'])
+        self.test_employee.active = False
+        res = self.employee_model.register_attendance(new_code)
+        self.assertFalse(res['logged'])
+
+    def test_register_attendance_events(self):
+        """Buffered swipes are journaled and replayed only once"""
+        events = [
+            ('evt-2', self.rfid_card_code, '2018-01-02 17:00:00', 'reader_1'),
+            ('evt-1', self.rfid_card_code, '2018-01-02 08:00:00', 'reader_1'),
+            ('evt-1', self.rfid_card_code, '2018-01-02 08:00:00', 'reader_1'),
+        ]
+        res = self.employee_model.register_attendance_events(events)
+        self.assertEqual(len(res), 3)
+        self.assertEqual(res[0]['action'], 'check_out')
+        self.assertFalse(res[0]['duplicate'])
+        self.assertEqual(res[1]['action'], 'check_in')
+        self.assertEqual(res[1]['event_id'], 'evt-1')
+        self.assertTrue(res[2]['duplicate'])
+        journal = self.env['hr.attendance.rfid.event'].search([
+            ('event_uid', 'in', ['evt-1', 'evt-2']),
+        ])
+        self.assertEqual(len(journal), 2)
+        self.assertEqual(set(journal.mapped('state')), {'done'})
+        # Sending the buffer again doesn't toggle the employee
+        res = self.employee_model.register_attendance_events(events)
+        self.assertTrue(all(x['duplicate'] for x in res))
+        self.assertEqual(res[0]['action'], 'check_out')
+        attendances = self.env['hr.attendance'].search([
+            ('employee_id', '=', self.test_employee.id),
+            ('check_in', '>=', '2018-01-02 00:00:00'),
+            ('check_in', '<', '2018-01-03 00:00:00'),
+        ])
+        self.assertEqual(len(attendances), 1)
+        self.assertEqual(
+            fields.Datetime.to_string(attendances.check_out),
+            '2018-01-02 17:00:00',
+        )
+
+    def test_register_attendance_events_invalid(self):
+        """An invalid event doesn't prevent storing the other ones"""
+        res = self.employee_model.register_attendance_events([
+            ('evt-3', self.rfid_card_code, False, 'reader_1'),
+            ('evt-4', self.rfid_card_code, '2018-01-03 08:00:00', 'reader_1'),
+        ])
+        self.assertEqual(len(res), 2)
+        self.assertFalse(res[0]['logged'])
+        self.assertEqual(res[0]['event_id'], 'evt-3')
+        self.assertTrue(res[0]['error_message'])
+        self.assertTrue(res[1]['logged'])
+        self.assertEqual(res[1]['action'], 'check_in')
+        journal = self.env['hr.attendance.rfid.event'].search([
+            ('event_uid', 'in', ['evt-3', 'evt-4']),
+        ])
+        self.assertEqual(journal.mapped('event_uid'), ['evt-4'])
+
+    def test_swipe_timing(self):
+        """Swipe timings are aggregated per reader and hour"""
+        self.env['ir.config_parameter'].sudo().set_param(
+            'hr_attendance_rfid.timing', 'True')
+        self.employee_model.register_attendance(
+            self.rfid_card_code, 'reader_stats')
+        self.employee_model.register_attendance('029238d', 'reader_stats')
+        timings = self.env['hr.attendance.rfid.timing'].search([
+            ('reader_id', '=', 'reader_stats'),
+        ])
+        self.assertEqual(
+            sorted(timings.mapped('result')), ['done', 'not_found'])
+        self.assertTrue(all(x.total_time >= x.lookup_time for x in timings))
+        stats = self.env['hr.attendance.rfid.stats'].search([
+            ('reader_id', '=', 'reader_stats'),
+        ])
+        self.assertEqual(sum(stats.mapped('swipe_count')), 2)
+        self.assertEqual(sum(stats.mapped('not_found_count')), 1)
+        self.assertEqual(sum(stats.mapped('error_count')), 0)
+        self.assertTrue(
+            all(x.total_time_p99 >= x.total_time_p50 for x in stats))
@@ -3,7 +3,7 @@
 
 {
     'name': 'HR Employee Document',
-    'version': '12.0.1.0.0',
+    'version': '12.0.1.2.0',
     'category': 'Human Resources',
     'website': 'https://github.com/OCA/hr',
     'author':
@@ -18,6 +18,8 @@
         'document',
     ],
     'data': [
+        'security/ir.model.access.csv',
         'views/hr_employee.xml',
+        'reports/hr_employee_document_storage_report_views.xml',
     ],
 }
@@ -0,0 +1,47 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+import odoo
+from odoo import api, http, _
+from odoo.exceptions import AccessError
+from odoo.http import request, content_disposition
+
+
+class HrEmployeeDocumentController(http.Controller):
+
+    @http.route('/hr_employee_document/export', type='http', auth='user')
+    def export_documents(self, ids, **kwargs):
+        """Stream the ZIP archive of the documents of the given employees
+        while it is built, so neither the memory nor the disk used depend on
+        the size of the documents."""
+        if not request.env.user.has_group('hr.group_hr_user'):
+            raise AccessError(_(
+                'Only HR officers can export the documents of employees.'
+            ))
+        employees = request.env['hr.employee'].browse(
+            [int(employee_id) for employee_id in ids.split(',')]
+        ).exists()
+        return http.Response(
+            self._iter_documents_zip(
+                request.env.cr.dbname,
+                request.env.uid,
+                employees.ids,
+                dict(request.env.context),
+            ),
+            headers=[
+                ('Content-Type', 'application/zip'),
+                ('Content-Disposition', content_disposition(
+                    'employee_documents.zip'
+                )),
+            ],
+            direct_passthrough=True,
+        )
+
+    def _iter_documents_zip(self, dbname, uid, employee_ids, context):
+        """Build the archive with its own cursor, as the response is sent
+        once the cursor of the request is closed."""
+        with api.Environment.manage(), \
+                odoo.registry(dbname).cursor() as cr:
+            env = api.Environment(cr, uid, context)
+            yield from env['hr.employee'].browse(
+                employee_ids
+            )._iter_documents_zip()
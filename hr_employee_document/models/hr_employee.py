@@ -1,8 +1,38 @@
 # Copyright 2018 Brainbean Apps (https://brainbeanapps.com)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+import base64
+import logging
+import os
+import re
+import zipfile
+from collections import defaultdict
+
 from odoo import fields, models, api
 
+_logger = logging.getLogger(__name__)
+
+
+class DocumentsZipStream(object):
+    """Write-only file object keeping what a ZIP archive writes until it is
+    drained, for sending the archive while it is built. As it can't be
+    seeked, the archive writes the sizes of each file after its data."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """Returns the chunks written since the last call."""
+        chunks, self.chunks = self.chunks, []
+        return chunks
+
 
 class HrEmployee(models.Model):
     _inherit = 'hr.employee'
@@ -14,24 +44,51 @@ class HrEmployee(models.Model):
         string='Documents',
     )
     documents_count = fields.Integer(
-        compute='_compute_document_ids',
+        compute='_compute_documents_count',
         groups='hr.group_hr_user',
         string='Document Count',
     )
 
-    def _compute_document_ids(self):
-        attachments = self.env['ir.attachment'].search([
+    @api.multi
+    def _get_documents_domain(self):
+        return [
             ('res_model', '=', self._name),
             ('res_id', 'in', self.ids),
-        ])
+            ('res_field', '=', False),
+        ]
+
+    @api.multi
+    def _compute_document_ids(self):
+        Attachment = self.env['ir.attachment']
+        # Only the related record is read, not the whole attachment rows
+        attachments = Attachment.search_read(
+            self._get_documents_domain(),
+            ['res_id'],
+        )
 
-        result = dict.fromkeys(self.ids, self.env['ir.attachment'])
+        result = dict((employee_id, []) for employee_id in self.ids)
+        for attachment in attachments:
+            result[attachment['res_id']].append(attachment['id'])
+
+        for employee in self:
+            employee.document_ids = Attachment.browse(
+                result.get(employee.id, [])
+            )
+
+    @api.multi
+    def _compute_documents_count(self):
+        # Counted from a search, as read_group doesn't apply the access
+        # filtering of attachments
+        attachments = self.env['ir.attachment'].search_read(
+            self._get_documents_domain(),
+            ['res_id'],
+        )
+        result = defaultdict(int)
         for attachment in attachments:
-            result[attachment.res_id] |= attachment
+            result[attachment['res_id']] += 1
 
         for employee in self:
-            employee.document_ids = result[employee.id]
-            employee.documents_count = len(employee.document_ids)
+            employee.documents_count = result[employee.id]
 
     @api.multi
     def action_get_attachment_tree_view(self):
@@ -48,3 +105,154 @@ class HrEmployee(models.Model):
             self.env.ref('hr_employee_document.ir_attachment_view_search').id,
         )
         return action
+
+    @api.model
+    def _deduplicate_documents(self):
+        """Move to the filestore the documents of the employees stored in
+        database whose content is already in a file of the filestore, making
+        them share that file. Documents in the filestore are not touched, as
+        files are already shared by content there. Nothing is done if the
+        attachments are configured to be stored in database.
+
+        :return: Number of moved documents.
+        """
+        Attachment = self.env['ir.attachment']
+        if Attachment._storage() == 'db':
+            return 0
+        cr = self.env.cr
+        cr.execute("""
+            SELECT a.id, k.store_fname
+            FROM ir_attachment a
+            JOIN (
+                SELECT DISTINCT ON (checksum) checksum, store_fname
+                FROM ir_attachment
+                WHERE res_model = 'hr.employee'
+                    AND res_field IS NULL
+                    AND checksum IS NOT NULL
+                    AND store_fname IS NOT NULL
+                ORDER BY checksum, id
+            ) k ON k.checksum = a.checksum
+            WHERE a.res_model = 'hr.employee'
+                AND a.res_field IS NULL
+                AND a.store_fname IS NULL
+                AND a.db_datas IS NOT NULL
+            """)
+        rows = [
+            row for row in cr.fetchall()
+            if os.path.isfile(Attachment._full_path(row[1]))
+        ]
+        if not rows:
+            return 0
+        cr.execute("""
+            UPDATE ir_attachment AS a
+            SET store_fname = v.store_fname, db_datas = NULL
+            FROM (VALUES %s) AS v(id, store_fname)
+            WHERE a.id = v.id
+            """ % ', '.join(
+            cr.mogrify('(%s, %s)', row).decode() for row in rows
+        ))
+        Attachment.invalidate_cache(
+            ['store_fname', 'db_datas', 'datas'],
+            [row[0] for row in rows],
+        )
+        _logger.info(
+            '%d employee documents moved from database to filestore',
+            len(rows),
+        )
+        return len(rows)
+
+    @api.multi
+    def action_export_documents(self):
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/hr_employee_document/export?ids=%s' % (
+                ','.join(str(employee_id) for employee_id in self.ids)
+            ),
+            'target': 'self',
+        }
+
+    @api.multi
+    def _write_documents_zip(self, fileobj):
+        """Write the documents of the employees into a ZIP archive, in a
+        folder per employee.
+
+        :param fileobj: Writable file object receiving the archive.
+        """
+        for data in self._iter_documents_zip():
+            fileobj.write(data)
+
+    @api.multi
+    def _iter_documents_zip(self):
+        """Build the ZIP archive of the documents of the employees, yielding
+        its content after each document. Files of the filestore are read and
+        compressed chunk by chunk by the archive, so the memory used only
+        depends on the compressed size of the largest document.
+
+        :returns: generator of bytes
+        """
+        Attachment = self.env['ir.attachment']
+        attachments = Attachment.search_read(
+            self._get_documents_domain(),
+            ['res_id', 'name', 'datas_fname', 'store_fname', 'type'],
+            order='res_id, id',
+        )
+        folders = dict(
+            (employee.id, self._get_documents_zip_folder(employee))
+            for employee in self
+        )
+        arcnames = set()
+        stream = DocumentsZipStream()
+        with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for attachment in attachments:
+                if attachment['type'] != 'binary':
+                    continue
+                arcname = self._get_documents_zip_arcname(
+                    folders[attachment['res_id']],
+                    attachment['datas_fname'] or attachment['name'],
+                    arcnames,
+                )
+                if attachment['store_fname']:
+                    full_path = Attachment._full_path(
+                        attachment['store_fname']
+                    )
+                    if not os.path.isfile(full_path):
+                        _logger.warning(
+                            'Missing file %s of attachment %s',
+                            full_path, attachment['id'],
+                        )
+                        continue
+                    archive.write(full_path, arcname)
+                else:
+                    # Attachments stored in database are read one by one
+                    db_datas = Attachment.with_context(
+                        prefetch_fields=False,
+                    ).browse(attachment['id']).db_datas
+                    archive.writestr(
+                        arcname, base64.b64decode(db_datas or b'')
+                    )
+                yield from stream.drain()
+        yield from stream.drain()
+
+    @api.model
+    def _get_documents_zip_folder(self, employee):
+        return self._sanitize_documents_zip_name(
+            '%s (%s)' % (employee.name, employee.id)
+        )
+
+    @api.model
+    def _get_documents_zip_arcname(self, folder, filename, arcnames):
+        """Returns an unused path for the file in the ZIP archive"""
+        name, extension = os.path.splitext(
+            self._sanitize_documents_zip_name(filename or 'document')
+        )
+        arcname = '%s/%s%s' % (folder, name, extension)
+        index = 1
+        while arcname in arcnames:
+            index += 1
+            arcname = '%s/%s (%d)%s' % (folder, name, index, extension)
+        arcnames.add(arcname)
+        return arcname
+
+    @api.model
+    def _sanitize_documents_zip_name(self, name):
+        return re.sub(r'[\\/:*?"<>|]', '_', name).strip() or '_'
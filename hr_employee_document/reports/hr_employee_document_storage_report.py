@@ -0,0 +1,98 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from psycopg2.extensions import AsIs
+
+from odoo import api, fields, models, tools
+
+
+class HrEmployeeDocumentStorageReport(models.Model):
+    _name = 'hr.employee.document.storage.report'
+    _description = 'Storage used by the documents of the employees'
+    _auto = False
+    _rec_name = 'employee_id'
+    _order = 'total_size desc'
+
+    employee_id = fields.Many2one(
+        'hr.employee',
+        string='Employee',
+        readonly=True,
+    )
+    department_id = fields.Many2one(
+        'hr.department',
+        string='Department',
+        readonly=True,
+    )
+    company_id = fields.Many2one(
+        'res.company',
+        string='Company',
+        readonly=True,
+    )
+    documents_count = fields.Integer(
+        string='Document Count',
+        readonly=True,
+    )
+    total_size = fields.Float(
+        string='Total Size (MB)',
+        readonly=True,
+    )
+    unique_size = fields.Float(
+        string='Deduplicated Size (MB)',
+        readonly=True,
+        help='Size of the documents of the employee counting only once the '
+             'documents with the same content',
+    )
+    department_unique_size = fields.Float(
+        string='Department Deduplicated Size (MB)',
+        readonly=True,
+        help='Size of the documents counting only once the documents with '
+             'the same content in the whole department. Its sum by '
+             'department is the deduplicated size of the department',
+    )
+
+    @api.model_cr
+    def init(self):
+        # Each file is identified by its checksum, or by the attachment if
+        # there is no checksum, and is counted only by its first attachment
+        cr = self.env.cr
+        tools.drop_view_if_exists(cr, self._table)
+        cr.execute("""
+            CREATE OR REPLACE VIEW %s AS (
+                SELECT
+                    e.id AS id,
+                    e.id AS employee_id,
+                    e.department_id AS department_id,
+                    e.company_id AS company_id,
+                    COUNT(a.id) AS documents_count,
+                    COALESCE(SUM(a.file_size), 0) / 1048576.0 AS total_size,
+                    COALESCE(SUM(a.file_size) FILTER (
+                        WHERE a.employee_rank = 1
+                    ), 0) / 1048576.0 AS unique_size,
+                    COALESCE(SUM(a.file_size) FILTER (
+                        WHERE a.department_rank = 1
+                    ), 0) / 1048576.0 AS department_unique_size
+                FROM hr_employee e
+                JOIN (
+                    SELECT
+                        att.id,
+                        att.res_id,
+                        att.file_size,
+                        row_number() OVER (
+                            PARTITION BY
+                                att.res_id,
+                                COALESCE(att.checksum, att.id::text)
+                            ORDER BY att.id
+                        ) AS employee_rank,
+                        row_number() OVER (
+                            PARTITION BY
+                                COALESCE(emp.department_id, -emp.id),
+                                COALESCE(att.checksum, att.id::text)
+                            ORDER BY att.id
+                        ) AS department_rank
+                    FROM ir_attachment att
+                    JOIN hr_employee emp ON emp.id = att.res_id
+                    WHERE att.res_model = 'hr.employee'
+                        AND att.res_field IS NULL
+                        AND att.type = 'binary'
+                ) a ON a.res_id = e.id
+                GROUP BY e.id, e.department_id, e.company_id
+            )""", (AsIs(self._table), ))
@@ -2,6 +2,8 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
 
 import base64
+import io
+import zipfile
 
 from odoo.tests import common
 
@@ -36,3 +38,139 @@ class TestHrEmployeeDocument(common.TransactionCase):
             'name': 'Employee #2',
         })
         self.assertNotEqual(employee.action_get_attachment_tree_view(), None)
+
+    def test_3(self):
+        employees = self.SudoEmployee.create([
+            {'name': 'Employee #3.1'},
+            {'name': 'Employee #3.2'},
+        ])
+        attachments = self.SudoAttachment
+        for index in range(3):
+            attachments |= self.SudoAttachment.create({
+                'res_model': self.Employee._name,
+                'res_id': employees[0].id,
+                'datas': base64.b64encode(b'My attachment %d' % index),
+                'name': 'doc%d.txt' % index,
+                'datas_fname': 'doc%d.txt' % index,
+            })
+
+        self.assertEqual(employees.mapped('documents_count'), [3, 0])
+        self.assertEqual(
+            [len(employee.document_ids) for employee in employees], [3, 0]
+        )
+        self.assertEqual(employees[0].document_ids, attachments)
+        self.assertFalse(employees[1].document_ids)
+
+    def test_4(self):
+        employees = self.SudoEmployee.create([
+            {'name': 'Employee #4.1'},
+            {'name': 'Employee/#4.2'},
+        ])
+        for employee in employees:
+            for index in range(2):
+                self.SudoAttachment.create({
+                    'res_model': self.Employee._name,
+                    'res_id': employee.id,
+                    'datas': base64.b64encode(b'My attachment %d' % index),
+                    'name': 'doc.txt',
+                    'datas_fname': 'doc.txt',
+                })
+
+        fileobj = io.BytesIO()
+        employees._write_documents_zip(fileobj)
+
+        archive = zipfile.ZipFile(fileobj)
+        folder_1 = 'Employee #4.1 (%s)' % employees[0].id
+        folder_2 = 'Employee_#4.2 (%s)' % employees[1].id
+        self.assertEqual(sorted(archive.namelist()), [
+            '%s/doc (2).txt' % folder_1,
+            '%s/doc.txt' % folder_1,
+            '%s/doc (2).txt' % folder_2,
+            '%s/doc.txt' % folder_2,
+        ])
+        self.assertEqual(
+            archive.read('%s/doc (2).txt' % folder_1), b'My attachment 1'
+        )
+        # The archive is sent while it is built, document by document
+        chunks = list(employees._iter_documents_zip())
+        self.assertGreaterEqual(len(chunks), 4)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+        self.assertEqual(len(archive.namelist()), 4)
+        self.assertEqual(
+            archive.read('%s/doc.txt' % folder_1), b'My attachment 0'
+        )
+        self.assertEqual(
+            archive.read('%s/doc (2).txt' % folder_2), b'My attachment 1'
+        )
+        self.assertIsNone(archive.testzip())
+        action = employees.action_export_documents()
+        self.assertIn('%s,%s' % tuple(employees.ids), action['url'])
+
+    def test_5(self):
+        department = self.env['hr.department'].sudo().create({
+            'name': 'Department #5',
+        })
+        employees = self.SudoEmployee.create([
+            {'name': 'Employee #5.1', 'department_id': department.id},
+            {'name': 'Employee #5.2', 'department_id': department.id},
+        ])
+        content = b'My attachment' * 1024
+        for employee in employees | employees[0]:
+            self.SudoAttachment.create({
+                'res_model': self.Employee._name,
+                'res_id': employee.id,
+                'datas': base64.b64encode(content),
+                'name': 'doc.txt',
+                'datas_fname': 'doc.txt',
+            })
+
+        reports = self.env['hr.employee.document.storage.report'].search([
+            ('department_id', '=', department.id),
+        ])
+        size = len(content) / 1048576.0
+        report = reports.filtered(lambda r: r.employee_id == employees[0])
+        self.assertEqual(report.documents_count, 2)
+        self.assertAlmostEqual(report.total_size, 2 * size)
+        self.assertAlmostEqual(report.unique_size, size)
+        self.assertAlmostEqual(sum(reports.mapped('total_size')), 3 * size)
+        self.assertAlmostEqual(
+            sum(reports.mapped('department_unique_size')), size
+        )
+
+    def test_6(self):
+        employee = self.SudoEmployee.create({
+            'name': 'Employee #6',
+        })
+        content = base64.b64encode(b'My attachment')
+        file_attachment = self.SudoAttachment.create({
+            'res_model': self.Employee._name,
+            'res_id': employee.id,
+            'datas': content,
+            'name': 'doc.txt',
+            'datas_fname': 'doc.txt',
+        })
+        self.env['ir.config_parameter'].sudo().set_param(
+            'ir_attachment.location', 'db'
+        )
+        db_attachment = self.SudoAttachment.create({
+            'res_model': self.Employee._name,
+            'res_id': employee.id,
+            'datas': content,
+            'name': 'doc.txt',
+            'datas_fname': 'doc.txt',
+        })
+        self.assertFalse(db_attachment.store_fname)
+        # Documents are kept in database if configured so
+        self.assertEqual(self.SudoEmployee._deduplicate_documents(), 0)
+
+        self.env['ir.config_parameter'].sudo().set_param(
+            'ir_attachment.location', 'file'
+        )
+        self.assertEqual(self.SudoEmployee._deduplicate_documents(), 1)
+
+        self.assertEqual(
+            db_attachment.store_fname, file_attachment.store_fname
+        )
+        self.assertFalse(db_attachment.db_datas)
+        self.assertEqual(db_attachment.datas, content)
+        self.assertEqual(self.SudoEmployee._deduplicate_documents(), 0)
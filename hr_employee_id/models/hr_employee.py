@@ -5,12 +5,14 @@
 
 import logging
 import random
-import string
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
 
 _logger = logging.getLogger(__name__)
 
+# Ratio of used random identifiers from which a warning is logged
+ID_SPACE_WARNING_RATIO = 0.8
+
 
 class HrEmployee(models.Model):
     """Implement company wide unique identification number."""
@@ -30,36 +32,165 @@ class HrEmployee(models.Model):
     @api.model
     def _generate_identification_id(self):
         """Generate a random employee identification number"""
+        return self._generate_identification_ids(1)[0]
+
+    @api.model
+    def _generate_identification_ids(self, count):
+        """Generate several unique employee identification numbers at once.
+
+        Each round draws a block of candidates and discards the ones already
+        in use with a single query, so the number of queries doesn't depend
+        on the number of identifiers.
+
+        :param count: Number of identifiers to generate.
+        :return: List of identifiers, or of False values if no sequence is
+          configured.
+        """
         company = self.env.user.company_id
+        if (company.employee_id_gen_method == 'sequence'
+                and not company.employee_id_sequence):
+            _logger.warning(
+                'No sequence configured for employee ID generation'
+            )
+            return [False] * count
+        # Counting the used identifiers is only worth it for several ones or
+        # when collisions tell that their space is getting full
+        check_space = company.employee_id_gen_method == 'random'
+        if check_space and count > 1:
+            self._check_identification_id_random_space(count)
+            check_space = False
 
+        employee_ids = []
         for retry in range(50):
-            employee_id = False
+            missing = count - len(employee_ids)
+            if not missing:
+                return employee_ids
+            if check_space and retry:
+                self._check_identification_id_random_space(count)
+                check_space = False
             if company.employee_id_gen_method == 'sequence':
-                if not company.employee_id_sequence:
-                    _logger.warning(
-                        'No sequence configured for employee ID generation'
-                    )
-                    return employee_id
-                employee_id = company.employee_id_sequence.next_by_id()
-            elif company.employee_id_gen_method == 'random':
-                employee_id_random_digits = company.employee_id_random_digits
-                rnd = random.SystemRandom()
-                employee_id = ''.join(
-                    rnd.choice(string.digits)
-                    for _ in range(employee_id_random_digits)
+                candidates = self._draw_identification_ids_sequence(
+                    company.employee_id_sequence, missing
                 )
-
-            if self.search_count([('identification_id', '=', employee_id)]):
-                continue
-
-            return employee_id
+            else:
+                candidates = self._draw_identification_ids_random(
+                    company.employee_id_random_digits,
+                    missing,
+                    exclude=set(employee_ids),
+                )
+            # Archived employees and other companies ones must be checked too
+            employees = self.sudo().with_context(active_test=False)
+            taken = set(employees.search([
+                ('identification_id', 'in', candidates),
+            ]).mapped('identification_id'))
+            employee_ids += [
+                x for x in candidates if x not in taken
+            ][:missing]
+        if len(employee_ids) == count:
+            return employee_ids
 
         raise UserError(
-            _('Unable to generate unique Employee ID in %d steps.', retry)
+            _('Unable to generate unique Employee ID in %d steps.') % retry
         )
 
     @api.model
-    def create(self, vals):
-        if not vals.get('identification_id'):
-            vals['identification_id'] = self._generate_identification_id()
-        return super(HrEmployee, self).create(vals)
+    def _draw_identification_ids_sequence(self, sequence, count):
+        """Draw the next values of the identification sequence.
+
+        The values are reserved with a single query, as `ir.sequence` does
+        for one value, unless the sequence uses date ranges.
+        """
+        if count == 1 or sequence.use_date_range:
+            return [sequence.next_by_id() for _ in range(count)]
+        sequence.check_access_rights('read')
+        if sequence.implementation == 'standard':
+            self.env.cr.execute(
+                "SELECT nextval('ir_sequence_%03d') "
+                "FROM generate_series(1, %%s)" % sequence.id,
+                (count, ),
+            )
+            numbers = [x[0] for x in self.env.cr.fetchall()]
+        else:
+            self.env.cr.execute(
+                "SELECT number_next FROM ir_sequence "
+                "WHERE id = %s FOR UPDATE NOWAIT",
+                (sequence.id, ),
+            )
+            number_next = self.env.cr.fetchone()[0]
+            self.env.cr.execute(
+                "UPDATE ir_sequence SET number_next = number_next + %s "
+                "WHERE id = %s",
+                (sequence.number_increment * count, sequence.id),
+            )
+            sequence.invalidate_cache(['number_next'], sequence.ids)
+            numbers = [
+                number_next + index * sequence.number_increment
+                for index in range(count)
+            ]
+        return [sequence.get_next_char(number) for number in numbers]
+
+    @api.model
+    def _draw_identification_ids_random(self, digits, count, exclude=None):
+        """Draw a block of distinct random identification numbers.
+
+        Twice the requested number is drawn, so most of the time a single
+        block is enough even when the identifiers space is half used.
+        """
+        exclude = exclude or set()
+        capacity = 10 ** digits
+        size = min(capacity, 2 * count + len(exclude))
+        rnd = random.SystemRandom()
+        candidates = [
+            str(x).zfill(digits) for x in rnd.sample(range(capacity), size)
+        ]
+        return [x for x in candidates if x not in exclude]
+
+    @api.model
+    def _get_identification_id_usage(self, digits=None):
+        """Returns the number of random identification numbers in use and the
+        number of available ones for the given number of digits.
+
+        :param digits: Number of digits, the one of the user company if not
+          given.
+        :return: Tuple (used, capacity).
+        """
+        if digits is None:
+            digits = self.env.user.company_id.employee_id_random_digits
+        self.env.cr.execute("""
+            SELECT COUNT(*)
+            FROM hr_employee
+            WHERE identification_id ~ %s
+            """, ('^[0-9]{%d}$' % digits, ))
+        return self.env.cr.fetchone()[0], 10 ** digits
+
+    @api.model
+    def _check_identification_id_random_space(self, count):
+        """Ensure there are enough free random identification numbers and
+        warn when their space is getting full"""
+        digits = self.env.user.company_id.employee_id_random_digits
+        used, capacity = self._get_identification_id_usage(digits)
+        if used + count > capacity:
+            raise UserError(_(
+                'Unable to generate %d unique Employee IDs: only %d of the '
+                '%d IDs of %d digits are available. Increase the number of '
+                'digits of the identifiers.'
+            ) % (count, capacity - used, capacity, digits))
+        if used + count > capacity * ID_SPACE_WARNING_RATIO:
+            _logger.warning(
+                '%d%% of the employee IDs of %d digits are used, consider '
+                'increasing the number of digits.',
+                100 * (used + count) // capacity, digits,
+            )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        vals_to_generate = [
+            vals for vals in vals_list if not vals.get('identification_id')
+        ]
+        if vals_to_generate:
+            employee_ids = self._generate_identification_ids(
+                len(vals_to_generate)
+            )
+            for vals, employee_id in zip(vals_to_generate, employee_ids):
+                vals['identification_id'] = employee_id
+        return super(HrEmployee, self).create(vals_list)
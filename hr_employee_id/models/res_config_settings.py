@@ -3,7 +3,7 @@
 # Copyright 2018 Brainbean Apps (https://brainbeanapps.com)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
-from odoo import fields, models
+from odoo import api, fields, models
 
 
 class ResConfigSettings(models.TransientModel):
@@ -19,6 +19,12 @@ class ResConfigSettings(models.TransientModel):
         readonly=False,
         default=lambda self: self._default_id_random_digits(),
     )
+    employee_id_random_usage = fields.Float(
+        string='Used IDs (%)',
+        compute='_compute_employee_id_random_usage',
+        help='Percentage of the random identifiers of this number of digits '
+             'that are already used by employees'
+    )
     employee_id_sequence = fields.Many2one(
         'ir.sequence',
         related='company_id.employee_id_sequence',
@@ -26,6 +32,18 @@ class ResConfigSettings(models.TransientModel):
         default=lambda self: self._default_id_sequence(),
     )
 
+    @api.depends('employee_id_random_digits')
+    def _compute_employee_id_random_usage(self):
+        employee_model = self.env['hr.employee'].sudo()
+        for settings in self:
+            if settings.employee_id_random_digits <= 0:
+                settings.employee_id_random_usage = 0.0
+                continue
+            used, capacity = employee_model._get_identification_id_usage(
+                settings.employee_id_random_digits
+            )
+            settings.employee_id_random_usage = 100.0 * used / capacity
+
     def _default_id_gen_method(self):
         gen_method = self.env.user.company_id.employee_id_gen_method
         if not gen_method:
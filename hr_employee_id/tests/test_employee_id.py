@@ -3,6 +3,7 @@
 # Copyright 2018 Brainbean Apps (https://brainbeanapps.com)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
+from odoo.exceptions import UserError
 from odoo.tests import common
 
 
@@ -71,3 +72,62 @@ class TestEmployeeID(common.TransactionCase):
         self.assertTrue(config.employee_id_gen_method == 'random')
         self.assertTrue(config.employee_id_random_digits == 5)
         self.assertFalse(config.employee_id_sequence is False)
+
+    def test_bulk_random_id_generation(self):
+        # test generation of several unique IDs at once
+        self.company.write({'employee_id_random_digits': 2})
+        employee = self.employee_model.create({'name': 'Employee'})
+        employee_ids = self.employee_model._generate_identification_ids(60)
+
+        self.assertEqual(len(set(employee_ids)), 60)
+        self.assertNotIn(employee.identification_id, employee_ids)
+        self.assertTrue(all(len(x) == 2 for x in employee_ids))
+
+    def test_random_id_space_usage(self):
+        # test reporting and exhaustion of the random IDs space
+        self.company.write({'employee_id_random_digits': 1})
+        used, capacity = self.employee_model._get_identification_id_usage()
+        self.assertEqual(capacity, 10)
+        employee_ids = self.employee_model._generate_identification_ids(
+            capacity - used
+        )
+        for employee_id in employee_ids:
+            self.employee_model.create({
+                'name': 'Employee', 'identification_id': employee_id,
+            })
+        self.assertEqual(
+            self.employee_model._get_identification_id_usage(), (10, 10)
+        )
+        config = self.env['res.config.settings'].create({})
+        self.assertEqual(config.employee_id_random_usage, 100.0)
+        with self.assertRaises(UserError):
+            self.employee_model._generate_identification_ids(1)
+
+    def test_multi_create_id_generation(self):
+        # test ID generation when creating several employees at once
+        employees = self.employee_model.create([
+            {'name': 'Employee 1'},
+            {'name': 'Employee 2', 'identification_id': 'THERE_YOU_GO'},
+            {'name': 'Employee 3'},
+        ])
+        self.assertEqual(employees[1].identification_id, 'THERE_YOU_GO')
+        self.assertEqual(len(set(employees.mapped('identification_id'))), 3)
+
+        for implementation in ('standard', 'no_gap'):
+            self.sequence.implementation = implementation
+            self.company.write({
+                'employee_id_gen_method': 'sequence',
+                'employee_id_sequence': self.sequence.id
+            })
+            employees = self.employee_model.create([
+                {'name': 'Employee %d' % index} for index in range(3)
+            ])
+            numbers = sorted(
+                int(x) for x in employees.mapped('identification_id')
+            )
+            self.assertEqual(
+                numbers, list(range(numbers[0], numbers[0] + 3))
+            )
+            self.assertEqual(
+                int(self.sequence.next_by_id()), numbers[-1] + 1
+            )
@@ -3,7 +3,7 @@
 
 {
     'name': 'HR Employee Service',
-    'version': '12.0.1.0.0',
+    'version': '12.0.1.1.0',
     'category': 'Human Resources',
     'website': 'https://github.com/OCA/hr',
     'author':
@@ -22,6 +22,7 @@
         ],
     },
     'data': [
+        'data/ir_cron.xml',
         'views/hr_employee.xml',
     ],
 }
@@ -43,6 +43,8 @@ class HrEmployee(models.Model):
         groups='hr.group_hr_user',
         readonly=True,
         compute='_compute_service_duration',
+        store=True,
+        index=True,
         help='Service duration in days',
     )
     service_duration_years = fields.Integer(
@@ -50,57 +52,165 @@ class HrEmployee(models.Model):
         groups='hr.group_hr_user',
         readonly=True,
         compute='_compute_service_duration_display',
+        store=True,
+        index=True,
     )
     service_duration_months = fields.Integer(
         string='Service Duration (months)',
         groups='hr.group_hr_user',
         readonly=True,
         compute='_compute_service_duration_display',
+        store=True,
     )
     service_duration_days = fields.Integer(
         string='Service Duration (days)',
         groups='hr.group_hr_user',
         readonly=True,
         compute='_compute_service_duration_display',
+        store=True,
     )
 
     @api.multi
     @api.depends('service_start_date', 'service_termination_date')
     def _compute_service_duration(self):
         for record in self:
-            service_until = (
-                record.service_termination_date or fields.Date.today()
-            )
-            if record.service_start_date and \
-                    service_until > record.service_start_date:
-                service_since = record.service_start_date
-                service_duration = fabs(
-                    (service_until - service_since) / timedelta(days=1)
-                )
-                record.service_duration = int(service_duration)
-            else:
-                record.service_duration = 0
+            record.service_duration = record._get_service_duration()[0]
 
     @api.multi
     @api.depends('service_start_date', 'service_termination_date')
     def _compute_service_duration_display(self):
         for record in self:
-            service_until = (
-                record.service_termination_date or fields.Date.today()
-            )
-            if record.service_start_date and \
-                    service_until > record.service_start_date:
-                service_duration = relativedelta(
-                    service_until,
-                    record.service_start_date
+            _, years, months, days = record._get_service_duration()
+            record.service_duration_years = years
+            record.service_duration_months = months
+            record.service_duration_days = days
+
+    @api.multi
+    def _get_service_duration(self, date=None):
+        """Returns the service duration of the employee as tuple (total days,
+        years, months, days) until the termination date or the given date,
+        today by default"""
+        self.ensure_one()
+        return self._get_service_duration_between(
+            self.service_start_date,
+            self.service_termination_date or date or fields.Date.today(),
+        )
+
+    @api.model
+    def _get_service_duration_between(self, service_since, service_until):
+        """Returns the service duration between two dates as tuple (total
+        days, years, months, days)"""
+        if not service_since or service_until <= service_since:
+            return 0, 0, 0, 0
+        service_duration = relativedelta(service_until, service_since)
+        return (
+            int(fabs((service_until - service_since) / timedelta(days=1))),
+            service_duration.years,
+            service_duration.months,
+            service_duration.days,
+        )
+
+    @api.multi
+    def get_service_durations(self, dates):
+        """Returns the service durations of the employees as of several
+        reference dates, for accrual or seniority computations.
+
+        The service is counted from its start until the reference date, or
+        until the termination date if it is earlier. The duration of each
+        distinct period is computed once for all the employees sharing it.
+
+        :param dates: List of reference dates.
+        :return: Dictionary by employee ID of dictionaries by reference date
+          of tuples (total days, years, months, days).
+        """
+        dates = [fields.Date.to_date(date) for date in dates]
+        spans = self._get_service_spans()
+        durations = {}
+        result = {}
+        for employee in self:
+            employee_spans = spans.get(employee.id, [])
+            result[employee.id] = employee_durations = {}
+            for date in dates:
+                period = self._get_service_period(employee_spans, date)
+                if period not in durations:
+                    durations[period] = self._get_service_duration_between(
+                        *period
+                    )
+                employee_durations[date] = durations[period]
+        return result
+
+    @api.multi
+    def _get_service_spans(self):
+        """Returns the periods of service of the employees as a dictionary
+        by employee ID of lists of tuples (start date, end date), where the
+        end date is False if the service isn't terminated"""
+        return {
+            employee.id: [(
+                employee.service_start_date,
+                employee.service_termination_date,
+            )]
+            for employee in self
+            if employee.service_start_date
+        }
+
+    @api.model
+    def _get_service_period(self, spans, date):
+        """Returns the tuple (start date, end date) of the service counted as
+        of the given date from the given periods of service"""
+        started_spans = [span for span in spans if span[0] <= date]
+        if not started_spans:
+            return False, date
+        service_since = min(span[0] for span in started_spans)
+        if all(span[1] and span[1] < date for span in started_spans):
+            return service_since, max(span[1] for span in started_spans)
+        return service_since, date
+
+    @api.model
+    def _cron_update_service_duration(self, date=None):
+        """Update the stored service durations that depend on the current
+        date, which are the ones of the employees without termination date.
+        The durations are computed once per start date and written with a
+        single query.
+
+        :param date: Date to compute the durations until, today by default.
+        """
+        date = date or fields.Date.today()
+        fnames = [
+            'service_duration',
+            'service_duration_years',
+            'service_duration_months',
+            'service_duration_days',
+        ]
+        employees = self.with_context(active_test=False).search([
+            ('service_start_date', '!=', False),
+            ('service_termination_date', '=', False),
+        ])
+        durations = {}
+        values = []
+        for employee in employees:
+            start_date = employee.service_start_date
+            if start_date not in durations:
+                durations[start_date] = self._get_service_duration_between(
+                    start_date, date
                 )
-                record.service_duration_years = service_duration.years
-                record.service_duration_months = service_duration.months
-                record.service_duration_days = service_duration.days
-            else:
-                record.service_duration_years = 0
-                record.service_duration_months = 0
-                record.service_duration_days = 0
+            duration = durations[start_date]
+            if duration != tuple(employee[fname] for fname in fnames):
+                values.append((employee.id, ) + duration)
+        if not values:
+            return
+        cr = self.env.cr
+        cr.execute("""
+            UPDATE hr_employee AS e
+            SET service_duration = v.duration,
+                service_duration_years = v.years,
+                service_duration_months = v.months,
+                service_duration_days = v.days
+            FROM (VALUES %s) AS v(id, duration, years, months, days)
+            WHERE e.id = v.id
+            """ % ', '.join(
+            cr.mogrify('(%s, %s, %s, %s, %s)', x).decode() for x in values
+        ))
+        self.invalidate_cache(fnames, [x[0] for x in values])
 
     @api.multi
     @api.onchange('service_hire_date')
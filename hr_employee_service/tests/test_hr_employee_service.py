@@ -118,3 +118,70 @@ class TestHrEmployeeService(common.TransactionCase):
         self.assertEqual(employee.service_duration_years, 0)
         self.assertEqual(employee.service_duration_months, 0)
         self.assertEqual(employee.service_duration_days, 1)
+
+    def test_8(self):
+        employee = self.SudoEmployee.create({
+            'name': 'Employee #8',
+            'service_start_date': fields.Date.to_date('2010-01-15'),
+        })
+        terminated_employee = self.SudoEmployee.create({
+            'name': 'Employee #8 (terminated)',
+            'service_start_date': fields.Date.to_date('2010-01-15'),
+            'service_termination_date': fields.Date.to_date('2015-01-15'),
+        })
+
+        self.assertIn(employee, self.SudoEmployee.search([
+            ('service_duration_years', '>=', 5),
+        ]))
+        self.assertEqual(terminated_employee.service_duration, 1826)
+
+        self.SudoEmployee._cron_update_service_duration(
+            fields.Date.to_date('2015-02-16')
+        )
+
+        self.assertEqual(employee.service_duration, 1858)
+        self.assertEqual(employee.service_duration_years, 5)
+        self.assertEqual(employee.service_duration_months, 1)
+        self.assertEqual(employee.service_duration_days, 1)
+        self.assertEqual(terminated_employee.service_duration, 1826)
+
+    def test_9(self):
+        employees = self.SudoEmployee.create([{
+            'name': 'Employee #9',
+            'service_start_date': fields.Date.to_date('2010-01-15'),
+        }, {
+            'name': 'Employee #9 (terminated)',
+            'service_start_date': fields.Date.to_date('2010-01-15'),
+            'service_termination_date': fields.Date.to_date('2012-03-01'),
+        }, {
+            'name': 'Employee #9 (not started)',
+        }])
+
+        durations = employees.get_service_durations([
+            '2009-12-31',
+            fields.Date.to_date('2011-01-31'),
+            fields.Date.to_date('2015-02-16'),
+        ])
+
+        employee, terminated_employee, not_started_employee = employees
+        self.assertEqual(durations[employee.id], {
+            fields.Date.to_date('2009-12-31'): (0, 0, 0, 0),
+            fields.Date.to_date('2011-01-31'): (381, 1, 0, 16),
+            fields.Date.to_date('2015-02-16'): (1858, 5, 1, 1),
+        })
+        self.assertEqual(
+            durations[terminated_employee.id][
+                fields.Date.to_date('2011-01-31')
+            ],
+            (381, 1, 0, 16)
+        )
+        self.assertEqual(
+            durations[terminated_employee.id][
+                fields.Date.to_date('2015-02-16')
+            ],
+            (776, 2, 1, 15)
+        )
+        self.assertEqual(
+            set(durations[not_started_employee.id].values()),
+            {(0, 0, 0, 0)}
+        )
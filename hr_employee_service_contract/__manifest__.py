@@ -3,7 +3,7 @@
 
 {
     'name': 'HR Employee Service from Contracts',
-    'version': '12.0.1.0.0',
+    'version': '12.0.1.1.0',
     'category': 'Human Resources',
     'website': 'https://github.com/OCA/hr',
     'author':
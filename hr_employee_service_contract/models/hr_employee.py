@@ -9,13 +9,17 @@ class HrEmployee(models.Model):
 
     first_contract_id = fields.Many2one(
         'hr.contract',
-        compute='_compute_first_contract_id',
+        compute='_compute_first_last_contract_id',
+        store=True,
+        compute_sudo=True,
         string='First Contract',
         help='First contract of the employee',
     )
     last_contract_id = fields.Many2one(
         'hr.contract',
-        compute='_compute_last_contract_id',
+        compute='_compute_first_last_contract_id',
+        store=True,
+        compute_sudo=True,
         string='Last Contract',
         help='Last contract of the employee',
     )
@@ -31,26 +35,90 @@ class HrEmployee(models.Model):
     )
 
     @api.multi
-    @api.depends('contract_ids')
-    def _compute_first_contract_id(self):
+    @api.depends(
+        'contract_ids',
+        'contract_ids.state',
+        'contract_ids.active',
+        'contract_ids.date_start',
+        'contract_ids.date_end',
+    )
+    def _compute_first_last_contract_id(self):
+        contracts = self._get_first_last_contracts()
         Contract = self.env['hr.contract']
         for employee in self:
-            employee.first_contract_id = Contract.search(
-                employee._get_contract_filter(),
-                order='date_start asc',
-                limit=1
+            first_contract_id, last_contract_id = contracts.get(
+                employee.id, (False, False)
             )
+            employee.first_contract_id = Contract.browse(first_contract_id)
+            employee.last_contract_id = Contract.browse(last_contract_id)
 
     @api.multi
-    @api.depends('contract_ids')
-    def _compute_last_contract_id(self):
-        Contract = self.env['hr.contract']
-        for employee in self:
-            employee.last_contract_id = Contract.search(
-                employee._get_contract_filter(),
-                order='date_end desc',
-                limit=1
+    def _get_first_last_contracts(self):
+        """Returns the first and last service contracts of the employees as
+        a dictionary of tuples (first contract ID, last contract ID) by
+        employee ID, found with a single query using window functions"""
+        query = self._get_service_contracts_query()
+        if not query:
+            return {}
+        from_clause, where_clause, params = query
+        self.env.cr.execute("""
+            SELECT DISTINCT
+                "hr_contract".employee_id,
+                first_value("hr_contract".id) OVER (
+                    PARTITION BY "hr_contract".employee_id
+                    ORDER BY "hr_contract".date_start ASC, "hr_contract".id
+                ),
+                first_value("hr_contract".id) OVER (
+                    PARTITION BY "hr_contract".employee_id
+                    ORDER BY "hr_contract".date_end DESC NULLS FIRST,
+                        "hr_contract".id
+                )
+            FROM %s
+            WHERE %s
+            """ % (from_clause, where_clause), params)
+        return {
+            employee_id: (first_contract_id, last_contract_id)
+            for employee_id, first_contract_id, last_contract_id
+            in self.env.cr.fetchall()
+        }
+
+    @api.multi
+    def _get_service_spans(self):
+        query = self._get_service_contracts_query()
+        if not query:
+            return {}
+        from_clause, where_clause, params = query
+        self.env.cr.execute("""
+            SELECT
+                "hr_contract".employee_id,
+                "hr_contract".date_start,
+                "hr_contract".date_end
+            FROM %s
+            WHERE %s
+                AND "hr_contract".date_start IS NOT NULL
+            """ % (from_clause, where_clause), params)
+        spans = {}
+        for employee_id, date_start, date_end in self.env.cr.fetchall():
+            spans.setdefault(employee_id, []).append(
+                (date_start, date_end or False)
             )
+        return spans
+
+    @api.multi
+    def _get_service_contracts_query(self):
+        """Returns the FROM and WHERE clauses and the parameters selecting
+        the service contracts of the employees, built from the domain of
+        `_get_service_contracts_filter`. Record rules are not applied, so
+        the stored fields don't depend on the user triggering their
+        computation. Returns None if there is no saved employee."""
+        employees = self.filtered(lambda x: isinstance(x.id, int))
+        if not employees:
+            return None
+        query = self.env['hr.contract'].sudo()._where_calc(
+            employees._get_service_contracts_filter()
+        )
+        from_clause, where_clause, params = query.get_sql()
+        return from_clause, where_clause or 'TRUE', params
 
     @api.multi
     @api.onchange('service_hire_date')
@@ -62,8 +130,14 @@ class HrEmployee(models.Model):
     def _get_contract_filter(self):
         self.ensure_one()
 
+        return self._get_service_contracts_filter()
+
+    @api.multi
+    def _get_service_contracts_filter(self):
+        """Returns the domain of the service contracts of all the employees
+        at once, used by the grouped queries"""
         return [
-            ('employee_id', '=', self.id),
+            ('employee_id', 'in', self.ids),
             ('state', 'in', self._get_service_contract_states()),
         ]
 
@@ -136,3 +136,94 @@ class TestHrEmployeeService(common.TransactionCase):
             employee.service_termination_date,
             False
         )
+
+    def test_6(self):
+        employees = self.SudoEmployee.create([{
+            'name': 'Employee #6.%d' % index,
+            'contract_ids': [
+                (0, 0, {
+                    'name': 'Employee #6.%d Contract #1' % index,
+                    'wage': 5000.0,
+                    'state': 'close',
+                    'date_start': self.today - relativedelta(years=5),
+                    'date_end': self.today - relativedelta(years=4),
+                }),
+                (0, 0, {
+                    'name': 'Employee #6.%d Contract #2' % index,
+                    'wage': 5000.0,
+                    'state': 'draft',
+                    'date_start': self.today - relativedelta(years=6),
+                }),
+            ],
+        } for index in range(3)])
+
+        contracts = employees._get_first_last_contracts()
+        for employee in employees:
+            closed_contract = employee.contract_ids.filtered(
+                lambda c: c.state == 'close'
+            )
+            self.assertEqual(
+                contracts[employee.id],
+                (closed_contract.id, closed_contract.id)
+            )
+            self.assertEqual(
+                employee.service_start_date,
+                self.today - relativedelta(years=5)
+            )
+
+        employee = employees[0]
+        draft_contract = employee.contract_ids.filtered(
+            lambda c: c.state == 'draft'
+        )
+        draft_contract.state = 'open'
+
+        self.assertEqual(employee.first_contract_id, draft_contract)
+        self.assertEqual(employee.last_contract_id, draft_contract)
+        self.assertEqual(
+            employee.service_start_date,
+            self.today - relativedelta(years=6)
+        )
+        self.assertEqual(employee.service_termination_date, False)
+        self.assertEqual(employee.service_duration_years, 6)
+        self.assertIn(employee, self.SudoEmployee.search([
+            ('first_contract_id', '=', draft_contract.id),
+        ]))
+
+    def test_7(self):
+        employee = self.SudoEmployee.create({
+            'name': 'Employee #7',
+            'contract_ids': [
+                (0, 0, {
+                    'name': 'Employee #7 Contract #1',
+                    'wage': 5000.0,
+                    'state': 'close',
+                    'date_start': fields.Date.to_date('2010-01-15'),
+                    'date_end': fields.Date.to_date('2011-01-14'),
+                }),
+                (0, 0, {
+                    'name': 'Employee #7 Contract #2',
+                    'wage': 5000.0,
+                    'state': 'open',
+                    'date_start': fields.Date.to_date('2012-01-15'),
+                }),
+            ],
+        })
+
+        durations = employee.get_service_durations([
+            fields.Date.to_date('2010-01-15'),
+            fields.Date.to_date('2011-06-30'),
+            fields.Date.to_date('2013-01-15'),
+        ])[employee.id]
+
+        self.assertEqual(
+            durations[fields.Date.to_date('2010-01-15')],
+            (0, 0, 0, 0)
+        )
+        self.assertEqual(
+            durations[fields.Date.to_date('2011-06-30')],
+            (364, 0, 11, 30)
+        )
+        self.assertEqual(
+            durations[fields.Date.to_date('2013-01-15')],
+            (1096, 3, 0, 0)
+        )
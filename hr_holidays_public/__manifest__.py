@@ -3,7 +3,7 @@
 
 {
     'name': 'HR Holidays Public',
-    'version': '12.0.1.0.0',
+    'version': '12.0.1.1.0',
     'license': 'AGPL-3',
     'category': 'Human Resources',
     'author': "Michael Telahun Makonnen, "
@@ -1,10 +1,13 @@
 # Copyright 2015 2011,2013 Michael Telahun Makonnen <mmakonnen@gmail.com>
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from datetime import date
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from dateutil.easter import easter
 
-from odoo import api, fields, models, _
-from odoo.exceptions import ValidationError
+from odoo import api, fields, models, tools, _
+from odoo.exceptions import UserError, ValidationError
 
 
 class HrHolidaysPublic(models.Model):
@@ -69,43 +72,89 @@ class HrHolidaysPublic(models.Model):
             result.append((rec.id, rec.display_name))
         return result
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        self.clear_caches()
+        return res
+
+    @api.multi
+    def write(self, vals):
+        res = super().write(vals)
+        self.clear_caches()
+        return res
+
+    @api.multi
+    def unlink(self):
+        res = super().unlink()
+        self.clear_caches()
+        return res
+
     @api.model
-    @api.returns('hr.holidays.public.line')
-    def get_holidays_list(self, year, employee_id=None):
+    def _get_employee_location(self, employee_id=None):
         """
-        Returns recordset of hr.holidays.public.line
-        for the specified year and employee
-        :param year: year as string
+        Returns the country and state used for selecting the public holidays
+        of the employee
         :param employee_id: ID of the employee
-        :return: recordset of hr.holidays.public.line
+        :return: tuple (country ID, state ID), with False for missing values.
+                 Country is None if there is no employee, so the holidays of
+                 all the countries are considered
+        """
+        if not employee_id:
+            return None, False
+        address = self.env['hr.employee'].sudo().browse(
+            employee_id).address_id
+        return address.country_id.id, address.state_id.id
+
+    @api.model
+    @tools.ormcache('year', 'country_id', 'state_id')
+    def _get_holidays_index(self, year, country_id=False, state_id=False):
+        """
+        Returns the public holidays of a year for a country and state. The
+        result is cached until public holidays are modified.
+        :param year: year as integer
+        :param country_id: ID of the country. If False, only global
+                           holidays are considered, and if None, the
+                           holidays of all the countries
+        :param state_id: ID of the country state. If not set, only holidays
+                         without states are considered
+        :return: tuple (frozenset of dates, tuple of line IDs)
         """
         holidays_filter = [('year', '=', year)]
-        employee = False
-        if employee_id:
-            employee = self.env['hr.employee'].browse(employee_id)
-            if employee.address_id and employee.address_id.country_id:
-                holidays_filter.append('|')
-                holidays_filter.append(('country_id', '=', False))
-                holidays_filter.append(('country_id',
-                                        '=',
-                                        employee.address_id.country_id.id))
-            else:
-                holidays_filter.append(('country_id', '=', False))
-        pholidays = self.search(holidays_filter)
+        if country_id:
+            holidays_filter += ['|',
+                                ('country_id', '=', False),
+                                ('country_id', '=', country_id)]
+        elif country_id is not None:
+            holidays_filter.append(('country_id', '=', False))
+        pholidays = self.sudo().search(holidays_filter)
         if not pholidays:
-            return list()
-
+            return frozenset(), ()
         states_filter = [('year_id', 'in', pholidays.ids)]
-        if employee and employee.address_id and employee.address_id.state_id:
+        if state_id:
             states_filter += ['|',
                               ('state_ids', '=', False),
-                              ('state_ids', '=',
-                               employee.address_id.state_id.id)]
+                              ('state_ids', '=', state_id)]
         else:
             states_filter.append(('state_ids', '=', False))
-        hhplo = self.env['hr.holidays.public.line']
+        hhplo = self.env['hr.holidays.public.line'].sudo()
         holidays_lines = hhplo.search(states_filter)
-        return holidays_lines
+        dates = frozenset(holidays_lines.mapped('date'))
+        return dates, tuple(holidays_lines.ids)
+
+    @api.model
+    @api.returns('hr.holidays.public.line')
+    def get_holidays_list(self, year, employee_id=None):
+        """
+        Returns recordset of hr.holidays.public.line
+        for the specified year and employee
+        :param year: year as string
+        :param employee_id: ID of the employee
+        :return: recordset of hr.holidays.public.line
+        """
+        country_id, state_id = self._get_employee_location(employee_id)
+        line_ids = self._get_holidays_index(int(year), country_id, state_id)[1]
+        return self.env['hr.holidays.public.line'].browse(line_ids)
 
     @api.model
     def is_public_holiday(self, selected_date, employee_id=None):
@@ -115,15 +164,45 @@ class HrHolidaysPublic(models.Model):
         :param employee_id: ID of the employee
         :return: bool
         """
-        holidays_lines = self.get_holidays_list(
-            selected_date.year, employee_id=employee_id)
-        if holidays_lines:
-            hol_date = holidays_lines.filtered(
-                lambda r: r.date == selected_date
-            )
-            if hol_date.ids:
-                return True
-        return False
+        if isinstance(selected_date, datetime):
+            selected_date = selected_date.date()
+        country_id, state_id = self._get_employee_location(employee_id)
+        dates = self._get_holidays_index(
+            selected_date.year, country_id, state_id)[0]
+        return selected_date in dates
+
+    @api.model
+    def get_employees_holidays(self, employee_ids, date_from, date_to):
+        """
+        Returns the public holidays of several employees in a range of dates.
+        Employees are grouped by country and state, so holidays are only
+        looked up once per location and year.
+        :param employee_ids: list of IDs of the employees
+        :param date_from: first date of the range
+        :param date_to: last date of the range
+        :return: dictionary with employee ID as key and frozenset of dates
+                 as value
+        """
+        date_from = fields.Date.to_date(date_from)
+        date_to = fields.Date.to_date(date_to)
+        employees_by_location = defaultdict(list)
+        for employee in self.env['hr.employee'].sudo().browse(employee_ids):
+            address = employee.address_id
+            employees_by_location[
+                (address.country_id.id, address.state_id.id)
+            ].append(employee.id)
+        res = {}
+        for location, location_employee_ids in employees_by_location.items():
+            dates = set()
+            for year in range(date_from.year, date_to.year + 1):
+                dates.update(
+                    x for x in self._get_holidays_index(year, *location)[0]
+                    if date_from <= x <= date_to
+                )
+            dates = frozenset(dates)
+            for employee_id in location_employee_ids:
+                res[employee_id] = dates
+        return res
 
 
 class HrHolidaysPublicLine(models.Model):
@@ -156,41 +235,223 @@ class HrHolidaysPublicLine(models.Model):
         'state_id',
         'Related States'
     )
+    rule_type = fields.Selection(
+        [
+            ('fixed', 'Fixed date'),
+            ('weekday', 'Weekday of the month'),
+            ('easter', 'Relative to Easter'),
+        ],
+        'Rule',
+        help='Rule for computing the date of this holiday when creating the '
+        'public holidays of other years from these ones. If not set, the '
+        'same day and month are used.',
+    )
+    rule_weekday = fields.Selection(
+        [
+            ('0', 'Monday'),
+            ('1', 'Tuesday'),
+            ('2', 'Wednesday'),
+            ('3', 'Thursday'),
+            ('4', 'Friday'),
+            ('5', 'Saturday'),
+            ('6', 'Sunday'),
+        ],
+        'Weekday',
+    )
+    rule_week_number = fields.Integer(
+        'Weekday Occurrence',
+        default=1,
+        help='Occurrence of the weekday inside the month of the date: 1 for '
+        'the first one, 2 for the second one... or -1 for the last one.',
+    )
+    rule_easter_offset = fields.Integer(
+        'Days from Easter',
+        help='Number of days after Easter Sunday, negative for days before '
+        'it.',
+    )
+    weekend_substitution = fields.Selection(
+        [
+            ('next', 'Next weekday'),
+            ('nearest', 'Nearest weekday'),
+        ],
+        'Weekend Substitution',
+        help='When the computed date falls on a weekend, move the holiday to '
+        'the next weekday, or to the nearest one (Friday for Saturday, '
+        'Monday for Sunday). Days taken by other holidays are skipped.',
+    )
+
+    @api.multi
+    @api.constrains('rule_type', 'rule_weekday', 'rule_week_number')
+    def _check_rule(self):
+        for line in self.filtered(lambda x: x.rule_type == 'weekday'):
+            if not line.rule_weekday:
+                raise ValidationError(_(
+                    'You must set the weekday of the holiday %s.'
+                ) % line.name)
+            if not line.rule_week_number or abs(line.rule_week_number) > 5:
+                raise ValidationError(_(
+                    'The weekday occurrence of the holiday %s must be between'
+                    ' 1 and 5, or between -5 and -1.'
+                ) % line.name)
 
     @api.multi
     @api.constrains('date', 'state_ids')
     def _check_date_state(self):
+        """Check all the lines at once, with one query for the duplicates
+        sharing a country state and another one for the duplicates without
+        states, whatever the number of lines.
+        """
         for line in self:
-            line._check_date_state_one()
-
-    def _check_date_state_one(self):
-        if self.date.year != self.year_id.year:
+            if line.date.year != line.year_id.year:
+                raise ValidationError(_(
+                    'Dates of holidays should be the same year as the'
+                    ' calendar year they are being assigned to'
+                ))
+        if not self:
+            return True
+        self.env.cr.execute("""
+            SELECT l1.date
+            FROM hr_holidays_public_line l1
+            JOIN hr_holiday_public_state_rel r1 ON r1.line_id = l1.id
+            JOIN hr_holiday_public_state_rel r2
+                ON r2.state_id = r1.state_id AND r2.line_id != l1.id
+            JOIN hr_holidays_public_line l2
+                ON l2.id = r2.line_id
+                AND l2.date = l1.date
+                AND l2.year_id = l1.year_id
+            WHERE l1.id IN %s
+            LIMIT 1
+            """, (tuple(self.ids), ))
+        row = self.env.cr.fetchone()
+        if row:
             raise ValidationError(_(
-                'Dates of holidays should be the same year as the calendar'
-                ' year they are being assigned to'
-            ))
-
-        if self.state_ids:
-            domain = [
-                ('date', '=', self.date),
-                ('year_id', '=', self.year_id.id),
-                ('state_ids', '!=', False),
-                ('id', '!=', self.id),
-            ]
-            holidays = self.search(domain)
-
-            for holiday in holidays:
-
-                if self.state_ids & holiday.state_ids:
-                    raise ValidationError(_(
-                        'You can\'t create duplicate public holiday per date'
-                        ' %s and one of the country states.'
-                    ) % self.date)
-        domain = [('date', '=', self.date),
-                  ('year_id', '=', self.year_id.id),
-                  ('state_ids', '=', False)]
-        if self.search_count(domain) > 1:
+                'You can\'t create duplicate public holiday per date'
+                ' %s and one of the country states.'
+            ) % row[0])
+        self.env.cr.execute("""
+            SELECT l.date
+            FROM hr_holidays_public_line l
+            WHERE (l.year_id, l.date) IN (
+                SELECT year_id, date
+                FROM hr_holidays_public_line
+                WHERE id IN %s
+            ) AND NOT EXISTS (
+                SELECT 1
+                FROM hr_holiday_public_state_rel r
+                WHERE r.line_id = l.id
+            )
+            GROUP BY l.year_id, l.date
+            HAVING count(*) > 1
+            LIMIT 1
+            """, (tuple(self.ids), ))
+        row = self.env.cr.fetchone()
+        if row:
             raise ValidationError(_(
                 'You can\'t create duplicate public holiday per date %s.'
-            ) % self.date)
+            ) % row[0])
         return True
+
+    def _get_rule_date(self, year):
+        """
+        Returns the date of this holiday for another year according to its
+        rule, without weekend substitution
+        :param year: year as integer
+        :return: date
+        """
+        self.ensure_one()
+        month = self.date.month
+        if self.rule_type == 'easter':
+            return easter(year) + timedelta(days=self.rule_easter_offset)
+        if self.rule_type == 'weekday':
+            weekday = int(self.rule_weekday)
+            if self.rule_week_number > 0:
+                first = date(year, month, 1)
+                new_date = first + timedelta(
+                    days=(weekday - first.weekday()) % 7 +
+                    7 * (self.rule_week_number - 1))
+            else:
+                last = date(year, month, monthrange(year, month)[1])
+                new_date = last - timedelta(
+                    days=(last.weekday() - weekday) % 7 +
+                    7 * (-self.rule_week_number - 1))
+            if new_date.month != month:
+                raise UserError(_(
+                    'The holiday %s has no weekday occurrence %s in %s.'
+                ) % (self.name, self.rule_week_number, year))
+            return new_date
+        if self.rule_type == 'fixed':
+            # 29th of February is moved to the 28th on non leap years
+            return date(year, month, min(
+                self.date.day, monthrange(year, month)[1]))
+        if month == 2 and self.date.day == 29:
+            # Handling this rare case would mean quite a lot of
+            # complexity because previous or next day might also be a
+            # public holiday.
+            raise UserError(_(
+                'You cannot use as template the public holidays '
+                'of a year that '
+                'includes public holidays on 29th of February '
+                '(2016, 2020...), please select a template from '
+                'another year.'))
+        return self.date.replace(year=year)
+
+    def _get_substitution_date(self, holiday_date, taken_dates):
+        """
+        Returns the weekday replacing a holiday falling on a weekend
+        :param holiday_date: date of the holiday, on a weekend
+        :param taken_dates: set of dates already taken by other holidays
+        :return: date
+        """
+        self.ensure_one()
+        if self.weekend_substitution == 'nearest' and \
+                holiday_date.weekday() == 5:
+            new_date = holiday_date - timedelta(days=1)
+        else:
+            new_date = holiday_date + timedelta(
+                days=7 - holiday_date.weekday())
+        while new_date in taken_dates or new_date.weekday() >= 5:
+            new_date += timedelta(days=1)
+        if new_date.year != holiday_date.year:
+            return holiday_date
+        return new_date
+
+    @api.multi
+    def _get_rule_dates(self, year):
+        """
+        Returns the dates of these holidays for another year according to
+        their rules, moving the ones falling on weekends
+        :param year: year as integer
+        :return: dictionary with line as key and date as value
+        """
+        rule_dates = {line: line._get_rule_date(year) for line in self}
+        to_substitute = {
+            line for line, holiday_date in rule_dates.items()
+            if line.weekend_substitution and holiday_date.weekday() >= 5
+        }
+        taken_dates = {
+            holiday_date for line, holiday_date in rule_dates.items()
+            if line not in to_substitute
+        }
+        for line in sorted(to_substitute, key=lambda x: rule_dates[x]):
+            rule_dates[line] = line._get_substitution_date(
+                rule_dates[line], taken_dates)
+            taken_dates.add(rule_dates[line])
+        return rule_dates
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        self.clear_caches()
+        return res
+
+    @api.multi
+    def write(self, vals):
+        res = super().write(vals)
+        self.clear_caches()
+        return res
+
+    @api.multi
+    def unlink(self):
+        res = super().unlink()
+        self.clear_caches()
+        return res
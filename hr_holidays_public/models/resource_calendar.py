@@ -2,17 +2,44 @@
 # Copyright 2018 Brainbean Apps
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import api, models
+from odoo import api, models, tools
 from odoo.addons.resource.models.resource import Intervals
 
 from pytz import timezone
 from datetime import datetime, time
-from dateutil import rrule
 
 
 class ResourceCalendar(models.Model):
     _inherit = 'resource.calendar'
 
+    @api.model
+    @tools.ormcache('tz_name', 'country_id', 'state_id', 'year')
+    def _get_public_holidays_intervals(self, tz_name, country_id, state_id,
+                                       year):
+        """Get the public holidays of a year for a location as intervals of
+        whole days in the given timezone. The result is cached until public
+        holidays are modified.
+
+        :param: tz_name: Name of the timezone of the intervals.
+        :param: country_id: Country ID. It can be false.
+        :param: state_id: Country state ID. It can be false.
+        :param: year: Year of the public holidays.
+        :return: Tuple of sorted tuples (start_datetime, end_datetime,
+          public holiday line ID).
+        """
+        tz = timezone(tz_name)
+        line_ids = self.env['hr.holidays.public']._get_holidays_index(
+            year, country_id, state_id,
+        )[1]
+        lines = self.env['hr.holidays.public.line'].sudo().browse(line_ids)
+        return tuple(sorted(
+            (
+                tz.localize(datetime.combine(line.date, time.min)),
+                tz.localize(datetime.combine(line.date, time.max)),
+                line.id,
+            ) for line in lines
+        ))
+
     def _public_holidays_leave_intervals(self, start_dt, end_dt, employee_id,
                                          tz):
         """Get the public holidays for the current employee and given dates in
@@ -23,28 +50,24 @@ class ResourceCalendar(models.Model):
         :param: employee_id: Employee ID. It can be false.
         :return: List of tuples with (start_date, end_date) as elements.
         """
-        HrHolidaysPublic = self.env['hr.holidays.public']
-
-        leaves = []
-        for day in rrule.rrule(rrule.YEARLY, dtstart=start_dt, until=end_dt):
-            lines = HrHolidaysPublic.get_holidays_list(
-                day.year, employee_id=employee_id,
+        country_id, state_id = self.env[
+            'hr.holidays.public'
+        ]._get_employee_location(employee_id)
+        holidays = []
+        for year in range(start_dt.astimezone(tz).year,
+                          end_dt.astimezone(tz).year + 1):
+            holidays.extend(
+                x for x in self._get_public_holidays_intervals(
+                    tz.zone, country_id, state_id, year,
+                ) if x[1] > start_dt and x[0] < end_dt
             )
-            for line in lines:
-                leaves.append(
-                    (
-                        datetime.combine(
-                            line.date,
-                            time.min
-                        ).replace(tzinfo=tz),
-                        datetime.combine(
-                            line.date,
-                            time.max
-                        ).replace(tzinfo=tz),
-                        line
-                    ),
-                )
-        return Intervals(leaves)
+        lines = self.env['hr.holidays.public.line'].browse(
+            [x[2] for x in holidays]
+        )
+        return Intervals([
+            (max(start, start_dt), min(stop, end_dt), line)
+            for (start, stop, line_id), line in zip(holidays, lines)
+        ])
 
     @api.multi
     def _leave_intervals(self, start_dt, end_dt, resource=None, domain=None):
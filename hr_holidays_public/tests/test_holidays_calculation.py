@@ -3,7 +3,10 @@
 # Copyright 2018 Brainbean Apps
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
+from datetime import datetime, time
+
 from odoo.tests import common
+from pytz import timezone
 
 
 class TestHolidaysComputeDaysBase(common.SavepointCase):
@@ -124,3 +127,31 @@ class TestHolidaysComputeDays(TestHolidaysComputeDaysBase):
         })
         leave_request._onchange_leave_dates()
         self.assertEqual(leave_request.number_of_days, 5)
+
+    def test_public_holidays_leave_intervals(self):
+        self.HrHolidaysPublic.create({
+            'year': 1947,
+            'line_ids': [
+                (0, 0, {
+                    'name': 'New Year',
+                    'date': '1947-01-01',
+                }),
+            ],
+        })
+        tz = timezone('UTC')
+        start_dt = tz.localize(datetime(1946, 12, 24, 12, 0))
+        end_dt = tz.localize(datetime(1947, 1, 1, 12, 0))
+        intervals = list(self.calendar._public_holidays_leave_intervals(
+            start_dt, end_dt, self.employee_2.id, tz,
+        ))
+        # 1946-12-23 is out of the window, and the rest are clipped to it
+        self.assertEqual(len(intervals), 3)
+        self.assertEqual(intervals[0][0], start_dt)
+        self.assertEqual(
+            intervals[1][0], tz.localize(datetime(1946, 12, 25, 0, 0)),
+        )
+        self.assertEqual(
+            intervals[1][1],
+            tz.localize(datetime.combine(datetime(1946, 12, 25), time.max)),
+        )
+        self.assertEqual(intervals[2][1], end_dt)
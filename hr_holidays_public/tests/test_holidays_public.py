@@ -113,6 +113,40 @@ class TestHolidaysPublic(TransactionCase):
                 'state_ids': [(6, 0, [self.env.ref('base.state_us_35').id])]
             })
 
+    def test_duplicate_date_state_batch_fail(self):
+        # ensures that duplicates are detected inside a batch creation
+        holiday4 = self.holiday_model.create({
+            'year': 1994,
+            'country_id': self.env.ref('base.us').id
+        })
+        lines = self.holiday_model_line.create([{
+            'name': 'holiday %s' % day,
+            'date': '1994-11-%02d' % day,
+            'year_id': holiday4.id,
+            'state_ids': [(6, 0, [self.env.ref('base.state_us_35').id])],
+        } for day in range(1, 29)])
+        self.assertEqual(len(lines), 28)
+        with self.assertRaises(ValidationError):
+            self.holiday_model_line.create([{
+                'name': 'holiday x',
+                'date': '1994-12-01',
+                'year_id': holiday4.id,
+            }, {
+                'name': 'holiday y',
+                'date': '1994-12-01',
+                'year_id': holiday4.id,
+            }])
+        with self.assertRaises(ValidationError):
+            self.holiday_model_line.create([{
+                'name': 'holiday x',
+                'date': '1994-11-14',
+                'year_id': holiday4.id,
+                'state_ids': [(6, 0, [
+                    self.env.ref('base.state_us_35').id,
+                    self.env.ref('base.state_us_5').id,
+                ])],
+            }])
+
     def test_isnot_holiday(self):
         # ensures that if given a date that is not an holiday it returns none
         self.assertFalse(self.holiday_model.is_public_holiday(
@@ -139,6 +173,43 @@ class TestHolidaysPublic(TransactionCase):
             employee_id=self.employee.id
         ))
 
+    def test_is_holiday_cache_invalidation(self):
+        # ensures that the cached holidays are refreshed on changes
+        self.assertTrue(self.holiday_model.is_public_holiday(
+            date(1994, 10, 14),
+            employee_id=self.employee.id
+        ))
+        line = self.holiday_model.get_holidays_list(
+            1994, employee_id=self.employee.id)
+        line.date = '1994-10-15'
+        self.assertFalse(self.holiday_model.is_public_holiday(
+            date(1994, 10, 14),
+            employee_id=self.employee.id
+        ))
+        self.assertTrue(self.holiday_model.is_public_holiday(
+            date(1994, 10, 15),
+            employee_id=self.employee.id
+        ))
+        line.unlink()
+        self.assertFalse(self.holiday_model.is_public_holiday(
+            date(1994, 10, 15),
+            employee_id=self.employee.id
+        ))
+
+    def test_employees_holidays(self):
+        # ensures that holidays are returned per employee for a range
+        employee_2 = self.employee_model.create({'name': 'Employee 2'})
+        res = self.holiday_model.get_employees_holidays(
+            [self.employee.id, employee_2.id],
+            date(1994, 10, 1), date(1995, 12, 30),
+        )
+        self.assertEqual(res[self.employee.id], {
+            date(1994, 10, 14), date(1995, 1, 1), date(1995, 10, 14),
+        })
+        self.assertEqual(res[employee_2.id], {
+            date(1995, 1, 1), date(1995, 10, 14),
+        })
+
     def test_holiday_line_year(self):
         # ensures that line year and holiday year are the same
         holiday4 = self.holiday_model.create({
@@ -196,6 +267,106 @@ class TestHolidaysPublic(TransactionCase):
             lambda r: r.year_id.country_id.id == self.env.ref('base.sl').id)
         self.assertEqual(len(res), 1)
 
+    def test_create_several_years_public_holidays(self):
+        val = {
+            'number_of_years': 3,
+        }
+        action = self.wizard_next_year.new(
+            values=val).create_public_holidays()
+        new_phs = self.holiday_model.search(action['domain'])
+        # 1 global template and 2 country templates for 3 years
+        self.assertEqual(len(new_phs), 9)
+        for year in (1996, 1997, 1998):
+            self.assertTrue(self.holiday_model.is_public_holiday(
+                date(year, 12, 31)
+            ))
+        lines = self.holiday_model.get_holidays_list(
+            1997, employee_id=self.employee.id)
+        self.assertEqual(len(lines), 4)
+
+    def test_create_public_holidays_rules(self):
+        holiday_gb_2019 = self.holiday_model.create({
+            'year': 2019,
+            'country_id': self.env.ref('base.uk').id,
+            'line_ids': [
+                (0, 0, {
+                    'name': 'Easter Monday',
+                    'date': '2019-04-22',
+                    'rule_type': 'easter',
+                    'rule_easter_offset': 1,
+                }),
+                (0, 0, {
+                    'name': 'Spring Bank Holiday',
+                    'date': '2019-05-27',
+                    'rule_type': 'weekday',
+                    'rule_weekday': '0',
+                    'rule_week_number': -1,
+                }),
+                (0, 0, {
+                    'name': 'Early May Bank Holiday',
+                    'date': '2019-05-06',
+                    'rule_type': 'weekday',
+                    'rule_weekday': '0',
+                    'rule_week_number': 1,
+                }),
+                (0, 0, {
+                    'name': 'Christmas Day',
+                    'date': '2019-12-25',
+                    'rule_type': 'fixed',
+                    'weekend_substitution': 'next',
+                }),
+                (0, 0, {
+                    'name': 'Boxing Day',
+                    'date': '2019-12-26',
+                    'rule_type': 'fixed',
+                    'weekend_substitution': 'next',
+                }),
+            ],
+        })
+        val = {
+            'template_ids': holiday_gb_2019,
+            'year': 2021,
+        }
+        self.wizard_next_year.new(values=val).create_public_holidays()
+        lines = self.holiday_model.search([
+            ('year', '=', 2021),
+            ('country_id', '=', self.env.ref('base.uk').id),
+        ]).line_ids
+        self.assertEqual(
+            {x.name: x.date for x in lines}, {
+                'Easter Monday': date(2021, 4, 5),
+                'Spring Bank Holiday': date(2021, 5, 31),
+                'Early May Bank Holiday': date(2021, 5, 3),
+                # 25th is Saturday and 26th is Sunday
+                'Christmas Day': date(2021, 12, 27),
+                'Boxing Day': date(2021, 12, 28),
+            },
+        )
+
+    def test_february_29th_fixed_rule(self):
+        holiday_tw_2016 = self.holiday_model.create({
+            'year': 2016,
+            'country_id': self.env.ref('base.tw').id
+        })
+        self.holiday_model_line.create({
+            'name': 'Peace Memorial Holiday',
+            'date': '2016-02-29',
+            'year_id': holiday_tw_2016.id,
+            'rule_type': 'fixed',
+        })
+        val = {
+            'template_ids': holiday_tw_2016,
+            'number_of_years': 4,
+        }
+        self.wizard_next_year.new(values=val).create_public_holidays()
+        lines = self.holiday_model.search([
+            ('year', 'in', (2019, 2020)),
+            ('country_id', '=', self.env.ref('base.tw').id),
+        ]).mapped('line_ids')
+        self.assertEqual(
+            lines.mapped('date'), [date(2019, 2, 28), date(2020, 2, 29)],
+        )
+
     def test_february_29th(self):
         # Ensures that users get a UserError (not a nasty Exception) when
         # trying to create public holidays from year including 29th of
@@ -25,6 +25,11 @@ class HolidaysPublicNextYearWizard(models.TransientModel):
         help='Year for which you want to create the public holidays. '
         'By default, the year following the template.',
     )
+    number_of_years = fields.Integer(
+        default=1,
+        help='Number of consecutive years to create, starting from the '
+        'above year.',
+    )
 
     @api.multi
     def create_public_holidays(self):
@@ -51,48 +56,54 @@ class HolidaysPublicNextYearWizard(models.TransientModel):
             else:
                 last_ph_dict[ph.country_id] = ph
 
-        new_ph_ids = []
-        for last_ph in last_ph_dict.values():
-
-            new_year = self.year or last_ph.year + 1
-
-            new_ph_vals = {
-                'year': new_year,
-            }
-
-            new_ph = last_ph.copy(new_ph_vals)
-
-            new_ph_ids.append(new_ph.id)
-
+        number_of_years = self.number_of_years or 1
+        if number_of_years < 1:
+            raise UserError(_('The number of years must be at least 1.'))
+
+        # Build all the public holidays of all the years at once, computing
+        # the dates of the lines in advance for failing before creating
+        new_ph_keys = []
+        new_ph_vals_list = []
+        new_dates = {}
+        for offset in range(number_of_years):
+            for last_ph in last_ph_dict.values():
+                new_year = (self.year or last_ph.year + 1) + offset
+                new_ph_keys.append((last_ph, new_year))
+                new_dates[(last_ph, new_year)] = (
+                    last_ph.line_ids._get_rule_dates(new_year))
+                new_ph_vals_list.append(last_ph.copy_data({
+                    'year': new_year,
+                })[0])
+        new_phs = ph_env.create(new_ph_vals_list)
+
+        # Build the lines of all the years as a single creation, so that
+        # constraints and dependent computations are done once
+        new_ph_line_vals_list = []
+        for (last_ph, new_year), new_ph in zip(new_ph_keys, new_phs):
             for last_ph_line in last_ph.line_ids:
-                feb_29 = (
-                    last_ph_line.date.month == 2 and
-                    last_ph_line.date.day == 29)
-
-                if feb_29:
-                    # Handling this rare case would mean quite a lot of
-                    # complexity because previous or next day might also be a
-                    # public holiday.
-                    raise UserError(_(
-                        'You cannot use as template the public holidays '
-                        'of a year that '
-                        'includes public holidays on 29th of February '
-                        '(2016, 2020...), please select a template from '
-                        'another year.'))
-
-                new_date = last_ph_line.date.replace(year=new_year)
-
-                new_ph_line_vals = {
-                    'date': new_date,
+                new_ph_line_vals_list.append(last_ph_line.copy_data({
+                    'date': new_dates[(last_ph, new_year)][last_ph_line],
                     'year_id': new_ph.id,
-                }
-                last_ph_line.copy(new_ph_line_vals)
-
-        domain = [['id', 'in', new_ph_ids]]
+                })[0])
+        new_ph_lines = self.env['hr.holidays.public.line'].create(
+            new_ph_line_vals_list)
+
+        summary = _(
+            '%d public holidays created for %d countries and %d years, '
+            'with %d dates'
+        ) % (
+            len(new_phs),
+            len(last_ph_dict),
+            number_of_years,
+            len(new_ph_lines),
+        )
+        _logger.info(summary)
+
+        domain = [['id', 'in', new_phs.ids]]
 
         action = {
             'type': 'ir.actions.act_window',
-            'name': 'New public holidays',
+            'name': summary,
             'view_mode': 'tree,form',
             'res_model': 'hr.holidays.public',
             'domain': domain
@@ -2,7 +2,7 @@
 # Copyright 2018-2019 Brainbean Apps
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import fields, models
+from odoo import api, fields, models
 
 
 class Employee(models.Model):
@@ -13,3 +13,32 @@ class Employee(models.Model):
         comodel_name='hr.employee.skill',
         inverse_name='employee_id',
     )
+
+    @api.model
+    def _get_skill_subtree_domain(self, skills, min_level=None):
+        """Returns a domain matching the employees having any of the given
+        skills or of their descendants with a minimum level, evaluated as a
+        subquery of the search."""
+        return [(
+            'id',
+            'inselect',
+            self.env['hr.employee.skill']._get_skill_subtree_query(
+                skills, min_level=min_level, column='employee_id'
+            ),
+        )]
+
+    @api.model
+    def search_by_skill_subtree(self, skills, min_level=None):
+        """Search the employees having any of the given skills or of their
+        descendants with a minimum level, such as any skill under
+        'Programming / Python' at least at 'Senior' level.
+
+        :param skills: hr.skill recordset or list of IDs.
+        :param min_level: Minimum level, as a value of the level selection of
+          the employee skills.
+        """
+        if not isinstance(skills, models.BaseModel):
+            skills = self.env['hr.skill'].browse(skills)
+        return self.search(
+            self._get_skill_subtree_domain(skills, min_level=min_level)
+        )
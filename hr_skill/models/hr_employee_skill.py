@@ -17,6 +17,7 @@ class EmployeeSkill(models.Model):
     skill_id = fields.Many2one(
         string='Skill',
         comodel_name='hr.skill',
+        index=True,
     )
     level = fields.Selection(
         string='Level',
@@ -42,14 +43,91 @@ class EmployeeSkill(models.Model):
     ]
 
     @api.multi
-    @api.depends('employee_id.name', 'skill_id.name', 'level')
+    @api.depends('employee_id.name', 'skill_id', 'level')
     def _compute_complete_name(self):
+        # Renames of skills are handled by _update_complete_name
+        for employee_skill in self:
+            employee_skill.complete_name = (
+                employee_skill._get_complete_name()
+            )
+
+    @api.multi
+    def _get_complete_name(self):
+        self.ensure_one()
         levels = dict(self._fields['level'].selection)
+        return _(
+            '%(employee)s, %(skill)s (%(level)s)'
+        ) % {
+            'employee': self.employee_id.name,
+            'skill': self.skill_id.name,
+            'level': levels.get(self.level),
+        }
+
+    @api.multi
+    def _update_complete_name(self):
+        """Update the complete names of the employee skills, writing the
+        changed ones with a single query."""
+        values = []
         for employee_skill in self:
-            employee_skill.complete_name = _(
-                '%(employee)s, %(skill)s (%(level)s)'
-            ) % {
-                'employee': employee_skill.employee_id.name,
-                'skill': employee_skill.skill_id.name,
-                'level': levels.get(employee_skill.level),
-            }
+            complete_name = employee_skill._get_complete_name()
+            if complete_name != employee_skill.complete_name:
+                values.append((employee_skill.id, complete_name))
+        if not values:
+            return
+        cr = self.env.cr
+        cr.execute("""
+            UPDATE hr_employee_skill AS es
+            SET complete_name = v.complete_name
+            FROM (VALUES %s) AS v(id, complete_name)
+            WHERE es.id = v.id
+            """ % ', '.join(
+            cr.mogrify('(%s, %s)', value).decode() for value in values
+        ))
+        self.invalidate_cache(['complete_name'], [x[0] for x in values])
+
+    @api.model
+    def _get_skill_subtree_query(self, skills, min_level=None,
+                                 column='id'):
+        """Returns the SQL query and its parameters selecting a column of the
+        employee skills of the given skills or of any of their descendants,
+        through the prefix of their parent path, with a minimum level.
+        """
+        conditions = ' OR '.join(
+            ['s.parent_path LIKE %s'] * len(skills)
+        ) or 'FALSE'
+        params = [skill.parent_path + '%' for skill in skills]
+        query = """
+            SELECT es.{column}
+            FROM hr_employee_skill es
+            JOIN hr_skill s ON s.id = es.skill_id
+            WHERE s.active AND ({conditions})
+        """.format(column=column, conditions=conditions)
+        if min_level is not None:
+            query += " AND es.level >= %s"
+            params.append(min_level)
+        return query, params
+
+    @api.model
+    def _get_skill_subtree_domain(self, skills, min_level=None):
+        """Returns a domain matching the employee skills of the given skills
+        or of any of their descendants with a minimum level, evaluated as a
+        subquery of the search."""
+        return [(
+            'id',
+            'inselect',
+            self._get_skill_subtree_query(skills, min_level=min_level),
+        )]
+
+    @api.model
+    def search_by_skill_subtree(self, skills, min_level=None):
+        """Search the employee skills of the given skills or of any of their
+        descendants with a minimum level.
+
+        :param skills: hr.skill recordset or list of IDs.
+        :param min_level: Minimum level, as a value of the level selection.
+        """
+        if not isinstance(skills, models.BaseModel):
+            skills = self.env['hr.skill'].browse(skills)
+        return self.search(
+            self._get_skill_subtree_domain(skills, min_level=min_level)
+        )
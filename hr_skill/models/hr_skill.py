@@ -2,7 +2,7 @@
 # Copyright 2018-2019 Brainbean Apps
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import api, fields, models, _
+from odoo import api, fields, models, tools, _
 
 
 class Skill(models.Model):
@@ -52,8 +52,32 @@ class Skill(models.Model):
         default=10,
     )
 
-    @api.depends('name', 'parent_id.complete_name')
+    @api.model_cr
+    def init(self):
+        # Index usable by the parent path prefix matching of subtree
+        # searches, whatever the collation of the database
+        tools.create_index(
+            self.env.cr,
+            'hr_skill_parent_path_pattern_index',
+            self._table,
+            ['parent_path text_pattern_ops'],
+        )
+
+    @api.multi
+    def write(self, values):
+        res = super().write(values)
+        if 'name' in values or 'parent_id' in values:
+            self._update_subtree_complete_name()
+        if 'name' in values:
+            self.env['hr.employee.skill'].search([
+                ('skill_id', 'in', self.ids),
+            ])._update_complete_name()
+        return res
+
+    @api.depends('name', 'parent_id')
     def _compute_complete_name(self):
+        # Descendants of renamed or moved skills are handled by
+        # _update_subtree_complete_name
         for group in self:
             if group.parent_id:
                 group.complete_name = _('%(parent)s / %(own)s') % ({
@@ -62,3 +86,44 @@ class Skill(models.Model):
                 })
             else:
                 group.complete_name = group.name
+
+    @api.multi
+    def _update_subtree_complete_name(self):
+        """Rebuild the complete names of the skills and their descendants in
+        a single pass ordered by parent path, so parents come before their
+        children, and write the changed ones with a single query, instead of
+        recomputing them one level at a time."""
+        skills = self.with_context(active_test=False).search(
+            [('id', 'child_of', self.ids)],
+            order='parent_path',
+        )
+        complete_names = {}
+        values = []
+        for skill in skills:
+            if skill.parent_id.id in complete_names:
+                complete_name = _('%(parent)s / %(own)s') % ({
+                    'parent': complete_names[skill.parent_id.id],
+                    'own': skill.name,
+                })
+            elif skill.parent_id:
+                complete_name = _('%(parent)s / %(own)s') % ({
+                    'parent': skill.parent_id.complete_name,
+                    'own': skill.name,
+                })
+            else:
+                complete_name = skill.name
+            complete_names[skill.id] = complete_name
+            if complete_name != skill.complete_name:
+                values.append((skill.id, complete_name))
+        if not values:
+            return
+        cr = self.env.cr
+        cr.execute("""
+            UPDATE hr_skill AS s
+            SET complete_name = v.complete_name
+            FROM (VALUES %s) AS v(id, complete_name)
+            WHERE s.id = v.id
+            """ % ', '.join(
+            cr.mogrify('(%s, %s)', value).decode() for value in values
+        ))
+        self.invalidate_cache(['complete_name'], [x[0] for x in values])
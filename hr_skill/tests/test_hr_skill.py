@@ -88,3 +88,123 @@ class TestHrSkill(TransactionCase):
                 )
             ).mapped('employee_id')
         )
+
+    def test_search_by_skill_subtree(self):
+        programming_skill = self.Skill.create({
+            'name': 'Programming',
+        })
+        python_skill = self.Skill.create({
+            'name': 'Python',
+            'parent_id': programming_skill.id,
+        })
+        django_skill = self.Skill.create({
+            'name': 'Django',
+            'parent_id': python_skill.id,
+        })
+        java_skill = self.Skill.create({
+            'name': 'Java',
+            'parent_id': programming_skill.id,
+        })
+
+        employee_django = self.Employee.create({
+            'name': 'Employee Django',
+            'employee_skill_ids': [
+                (0, False, {
+                    'skill_id': django_skill.id,
+                    'level': '2',
+                }),
+            ],
+        })
+        employee_python = self.Employee.create({
+            'name': 'Employee Python',
+            'employee_skill_ids': [
+                (0, False, {
+                    'skill_id': python_skill.id,
+                    'level': '0',
+                }),
+                (0, False, {
+                    'skill_id': java_skill.id,
+                    'level': '3',
+                }),
+            ],
+        })
+
+        self.assertEqual(
+            employee_django,
+            self.Employee.search_by_skill_subtree(python_skill, '2')
+        )
+        self.assertEqual(
+            employee_django | employee_python,
+            self.Employee.search_by_skill_subtree(python_skill.ids)
+        )
+        self.assertEqual(
+            employee_django | employee_python,
+            self.Employee.search_by_skill_subtree(programming_skill, '2')
+        )
+        self.assertEqual(
+            employee_python.employee_skill_ids.filtered(
+                lambda x: x.skill_id == java_skill
+            ),
+            self.EmployeeSkill.search_by_skill_subtree(
+                java_skill | django_skill, '3'
+            )
+        )
+        self.assertFalse(self.Employee.search_by_skill_subtree(
+            self.Skill
+        ))
+
+    def test_subtree_complete_name(self):
+        soft_skill = self.Skill.create({
+            'name': 'Soft skill',
+        })
+        leadership_skill = self.Skill.create({
+            'name': 'Leadership',
+            'parent_id': soft_skill.id,
+        })
+        coaching_skill = self.Skill.create({
+            'name': 'Coaching',
+            'parent_id': leadership_skill.id,
+        })
+        other_skill = self.Skill.create({
+            'name': 'Other',
+        })
+        employee = self.Employee.create({
+            'name': 'Employee',
+            'employee_skill_ids': [
+                (0, False, {
+                    'skill_id': soft_skill.id,
+                    'level': '1',
+                }),
+                (0, False, {
+                    'skill_id': coaching_skill.id,
+                    'level': '2',
+                }),
+            ],
+        })
+
+        soft_skill.name = 'Soft skills'
+
+        self.assertEqual(
+            coaching_skill.complete_name,
+            'Soft skills / Leadership / Coaching'
+        )
+        self.assertEqual(
+            sorted(employee.employee_skill_ids.mapped('complete_name')),
+            [
+                'Employee, Coaching (Senior)',
+                'Employee, Soft skills (Intermediate)',
+            ]
+        )
+
+        leadership_skill.parent_id = other_skill
+
+        self.assertEqual(
+            coaching_skill.complete_name,
+            'Other / Leadership / Coaching'
+        )
+        self.assertEqual(
+            self.Skill.search([
+                ('complete_name', '=', 'Other / Leadership / Coaching'),
+            ]),
+            coaching_skill
+        )